@@ -13,11 +13,29 @@ CyTag can either process Welsh text via standard input, or accepts the following
 	--- OPTIONAL: A directory in which output files will be saved.
 	--- OPTIONAL: A specific component to run the pipeline to, should running the entire pipeline not be required ('seg', 'sent', 'tok', 'pos').
 	--- REQUIRED: A format to write the pipeline's output ('tsv', 'xml' or 'all')
+	--- OPTIONAL: '--workers N', to process the input files in a pool of N worker processes (without writing the '_readings' debug files or updating 'unknown_words').
+	--- OPTIONAL: '--cg-workers N', to shard CG-3 disambiguation across N processes.
+	--- OPTIONAL: '--stream', to stream the input files through the pipeline segment by segment, writing the output as it is produced (for corpora too large to hold in memory).
+	--- OPTIONAL: '--hmm', to disambiguate POS tags with CyTag's (in-process) hidden Markov model rather than VISL CG-3.
 	or:
 	--- REQUIRED: 'evaluate'
 	--- OPTIONAL: 'soft' (for a more lenient evaluation of CyTag output).
 	--- REQUIRED: A gold standard (CyTag XML-formatted) dataset. 
 	--- REQUIRED: XML-formatted CyTag output to be evaluated.
+	or:
+	--- REQUIRED: 'compare-engines'
+	--- OPTIONAL: 'soft' (for a more lenient evaluation).
+	--- OPTIONAL: A gold standard (CyTag XML-formatted) dataset, if not the CorCenCC gold standard corpus.
+	or:
+	--- REQUIRED: 'compile-lexicon'
+	--- OPTIONAL: A (CorCenCC-formatted) lexicon file to compile, if not the default CorCenCC lexicon.
+	or:
+	--- REQUIRED: 'lexicon-memory'
+	--- OPTIONAL: A (CorCenCC-formatted) lexicon file to report on, if not the default CorCenCC lexicon.
+	or:
+	--- REQUIRED: 'serve'
+	--- OPTIONAL: An address for a long-running CyTag server to listen on - a port, a host and port, or the path to a Unix socket (see 'cy_server.py').
+	--- OPTIONAL: '--workers N', to keep N CG-3 workers running in the server, so that up to N requests are tagged at once (4 by default).
 
 Developed at Cardiff University as part of the CorCenCC project (www.corcencc.org).
 
@@ -39,14 +57,31 @@ from cy_tokeniser import *
 from cy_postagger import *
 
 from evaluate_cytag import *
+from shared.compile_lexicon import *
+from shared.load_lexicon import memory_report
+from shared.hmm_disambiguator import gold_file
+from cy_server import serve, default_workers
+from cy_parallel import run_in_parallel
+from cy_pipeline import run_pipeline
+from shared.resources import resources
 
-def process(arguments):
+def process(arguments, workers=1, stream=False):
 	# Create an empty output object
 	output = taggedobject()
 	# If more than one argument was passed...
 	if len(arguments) > 1: 
-		# If the fourth argument was not empty, return the output of the appropriate pipeline component ('seg', 'sent', 'tok', 'pos')
-		if arguments[3] != None:
+		# If the input files are to be streamed and the pipeline is being run to the tokeniser or the POS tagger, stream them through the pipeline (writing the output as it goes), and return
+		if stream == True and arguments[3] in [None, "tok", "pos"]:
+			run_pipeline(arguments[0], arguments[1], arguments[2], arguments[3], arguments[4])
+			return
+		# If more than one worker process is to be used and the pipeline is being run to the tokeniser or the POS tagger, process the input files in a pool of worker processes
+		if workers > 1 and arguments[3] in [None, "tok", "pos"]:
+			output = run_in_parallel(arguments[0], arguments[3], workers, arguments[4])
+			# If any of the files couldn't be processed, exit with an error
+			if output == None:
+				sys.exit(1)
+		# Or, if the fourth argument was not empty, return the output of the appropriate pipeline component ('seg', 'sent', 'tok', 'pos')
+		elif arguments[3] != None:
 			if arguments[3] == "seg":
 				output = segment_text(arguments[0], output)
 			elif arguments[3] == "sent":
@@ -73,8 +108,35 @@ def process(arguments):
 
 if __name__ == "__main__":
 	args = sys.argv[1:]
+	# Create a dictionary for the numbers of worker processes (for processing input files) and CG-3 processes (for sharding CG-3 disambiguation) to use
+	worker_options = {"--workers": 1, "--cg-workers": 1}
+	# If either number was passed, remove it from the arguments and record it (along with which were passed)
+	given_options = []
+	for option in worker_options.keys():
+		if args != None and option in args:
+			given_options.append(option)
+			option_index = args.index(option)
+			option_value = args[option_index+1] if option_index+1 < len(args) else ""
+			if option_value.isdigit() != True or int(option_value) < 1:
+				print("ARGUMENT ERROR: '{}' should be followed by the number of processes to run (1 or more).".format(option))
+				args = None
+			else:
+				worker_options[option] = int(option_value)
+				del args[option_index:option_index+2]
+	resources.cg_shards = worker_options["--cg-workers"]
+	# If the '--stream' flag was passed, remove it from the arguments and record it
+	stream = args != None and "--stream" in args
+	if stream == True:
+		args.remove("--stream")
+	# If the '--hmm' flag was passed, remove it from the arguments and disambiguate with the hidden Markov model rather than CG-3
+	if args != None and "--hmm" in args:
+		args.remove("--hmm")
+		resources.disambiguator = "hmm"
+	# If either number of processes was invalid, do nothing further
+	if args == None:
+		pass
 	# If no arguments were passed:
-	if len(args) == 0:
+	elif len(args) == 0:
 		# Alert the user if nothing has been passed to the program via standard input
 		if sys.stdin.isatty():
 			print("INPUT ERROR: No input to CyTag was detected, and nor were any arguments passed. Please either send Welsh text to CyTag as standard input, or pass arguments to the program. See the README file for more details on CyTag usage.")
@@ -98,6 +160,51 @@ if __name__ == "__main__":
 			# Otherwise...
 			else:
 				print("ARGUMENT ERROR: Two XML-formatted output files should be passed as arguments in order to evalate CyTag. An optional 'soft' flag can also be passed for a more lenient evaluation. The correct formatting of arguments is: 'evaluate' 'soft' (optional) GOLD_CORPUS (required) TEST_CORPUS (required)")
+		# Or, if the first argument is 'compare-engines'...
+		elif args[0] == "compare-engines":
+			# Take 'soft' (if it was passed) as the leniency, and any other argument as the gold standard dataset
+			leniency = "soft" if "soft" in args[1:] else None
+			gold_files = [arg for arg in args[1:] if arg != "soft"]
+			# If more than one gold standard dataset, or one that doesn't exist, was passed, alert the user to the correct formatting of arguments
+			if len(gold_files) > 1 or (len(gold_files) == 1 and os.path.isfile(gold_files[0]) != True):
+				print("ARGUMENT ERROR: At most one (existing) gold standard dataset can be passed in order to compare CyTag's disambiguation engines. The correct formatting of arguments is: 'compare-engines' 'soft' (optional) GOLD_CORPUS (optional)")
+			# Otherwise, compare the accuracy and speed of CG-3 and the hidden Markov model on the gold standard dataset
+			else:
+				compare_engines(leniency, gold_files[0] if len(gold_files) == 1 else gold_file)
+		# Or, if the first argument is 'compile-lexicon'...
+		elif args[0] == "compile-lexicon":
+			# If more than one lexicon file, or a lexicon file that doesn't exist, was passed, alert the user to the correct formatting of arguments
+			if len(args) > 2 or (len(args) == 2 and os.path.isfile(args[1]) != True):
+				print("ARGUMENT ERROR: At most one (existing) lexicon file can be passed in order to compile a lexicon snapshot. The correct formatting of arguments is: 'compile-lexicon' LEXICON_FILE (optional)")
+			# Otherwise, compile the lexicon to a memory-mappable snapshot alongside it
+			else:
+				source = args[1] if len(args) == 2 else lexicon_file
+				compiled = compile_lexicon(source, "{}.snapshot".format(source))
+				print("Compiled {} words ({} entries) from '{}' to '{}.snapshot'".format(compiled[0], compiled[1], source, source))
+		# Or, if the first argument is 'lexicon-memory'...
+		elif args[0] == "lexicon-memory":
+			# If more than one lexicon file, or a lexicon file that doesn't exist, was passed, alert the user to the correct formatting of arguments
+			if len(args) > 2 or (len(args) == 2 and os.path.isfile(args[1]) != True):
+				print("ARGUMENT ERROR: At most one (existing) lexicon file can be passed in order to report on the memory it takes up. The correct formatting of arguments is: 'lexicon-memory' LEXICON_FILE (optional)")
+			# Otherwise, print how much memory the lexicon takes up in each worker when loaded in each way
+			else:
+				source = args[1] if len(args) == 2 else lexicon_file
+				print("Lexicon '{}' ({:,} bytes):".format(source, os.path.getsize(source)))
+				for name, allocated, shared in memory_report(source):
+					# If the snapshot couldn't be compiled (e.g. the lexicon folder is read-only), report that it is unavailable
+					if allocated == None:
+						print("--- {}: unavailable (the snapshot could not be written alongside the lexicon)".format(name))
+					else:
+						print("--- {}: {:,} bytes allocated per worker{}".format(name, allocated, ", plus {:,} bytes mapped (shared between workers)".format(shared) if shared > 0 else ""))
+		# Or, if the first argument is 'serve'...
+		elif args[0] == "serve":
+			# If more than one address was passed, alert the user to the correct formatting of arguments
+			if len(args) > 2:
+				print("ARGUMENT ERROR: At most one address can be passed in order to run a CyTag server. The correct formatting of arguments is: 'serve' ADDRESS (optional - a port, HOST:PORT, or the path to a Unix socket) '--workers' N (optional)")
+			# Otherwise, run a CyTag server on the given address (or the default address), with the given number of CG-3 workers (or the default number)
+			else:
+				workers = worker_options["--workers"] if "--workers" in given_options else default_workers
+				serve(args[1], workers) if len(args) == 2 else serve(workers=workers)
 		# Or, if there was only one argument provided and it was not a file...
 		elif len(args) == 1 and os.path.isfile(args[0]) != True:
 			# Run the CyTag processing pipeline
@@ -135,7 +242,7 @@ if __name__ == "__main__":
 							else:
 								directory, component = text_args[1], text_args[2]
 								# Run the CyTag processing pipeline
-								process([input_files, output_name, directory, component, output_format])
+								process([input_files, output_name, directory, component, output_format], worker_options["--workers"], stream)
 						# If there is one remaining argument after the required output name...
 						elif len(text_args[1:-1]) == 1:
 							# If the remaining argument is in the list of pipeline components, set it as the component variable
@@ -145,8 +252,8 @@ if __name__ == "__main__":
 							else:
 								directory = text_args[1] 
 							# Run the CyTag processing pipeline
-							process([input_files, output_name, directory, component, output_format])
+							process([input_files, output_name, directory, component, output_format], worker_options["--workers"], stream)
 						# Otherwise...
 						else:
 							# Run the CyTag processing pipeline
-							process([input_files, output_name, directory, component, output_format])	
\ No newline at end of file
+							process([input_files, output_name, directory, component, output_format], worker_options["--workers"], stream)	
\ No newline at end of file
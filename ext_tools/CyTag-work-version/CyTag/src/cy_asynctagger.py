@@ -0,0 +1,111 @@
+#!usr/bin/env python3
+#-*- coding: utf-8 -*-
+"""
+'cy_asynctagger.py'
+
+An asyncio version of the reusable part-of-speech (POS) tagger, for embedding CyTag in asynchronous services (e.g. aiohttp or FastAPI). VISL CG-3 is run as asyncio subprocesses, and the Python stages of the pipeline (tokenisation, finding token readings, and mapping CG-3's output back to the tokens) are run in an executor, so that the event loop is never blocked while a text is being tagged. A limit can be set on the number of texts tagged at once - further requests wait their turn rather than starting more work.
+
+Accepts as arguments:
+	--- REQUIRED: One or more strings of Welsh language text (each is tagged as a separate request).
+
+Returns:
+	--- Tab-separated information about each POS tagged token, printed to standard output.
+
+Developed at Cardiff University as part of the CorCenCC project (www.corcencc.org).
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License or (at your option) any later version.
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with this program. If not, see <http://www.gnu.org/licenses>.
+"""
+
+import sys
+import asyncio
+
+from cy_tagger import tagger
+from cy_postagger import tokenise_documents, store_documents, generate_document_readings, skip_unambiguous_sentences, cgoutputmapper, check_cg_output, final_pass
+from shared.cg_worker import asynccgpool
+
+# The default number of texts (or lists of texts) that can be tagged at once
+default_concurrency = 4
+
+class asynctagger(tagger):
+	# A reusable POS tagger for asyncio programs, which tags up to a given number of texts at once without blocking the event loop
+	def __init__(self, concurrency=default_concurrency, executor=None):
+		# Load every resource the pipeline will need, without starting any (blocking) CG-3 workers
+		tagger.__init__(self, 0)
+		# Record the executor to run the Python stages in (if None, the event loop's default executor is used), and create a pool of CG-3 workers for the event loop (one for each text that can be tagged at once) if CG-3 is being used
+		self.executor = executor
+		self.cg_pool = asynccgpool(self.resources.vislcg3_location, size=concurrency) if self.ready == True and self.resources.disambiguator == "cg" else None
+		# Create a semaphore to limit the number of texts being tagged at once (it is created within each event loop the tagger is used from, the first time it is needed there)
+		self.concurrency = concurrency
+		self.limit, self.loop = None, None
+
+	async def tag(self, text):
+		# POS tag a string of Welsh text, and return the tagged output object (or None if tagging failed)
+		outputs = await self.tag_many([text])
+		return(outputs[0] if outputs != None else None)
+
+	async def tag_many(self, texts):
+		# POS tag a list of (short) texts together in one pass through CG-3, and return a tagged output object for each (or None if tagging failed)
+		if self.ready != True:
+			return
+		loop = asyncio.get_running_loop()
+		if self.loop is not loop:
+			self.limit, self.loop = asyncio.Semaphore(self.concurrency), loop
+		async with self.limit:
+			# If the hidden Markov model is being used, there is no CG-3 process to wait on, so tag the texts entirely in the executor
+			if self.cg_pool == None:
+				return(await loop.run_in_executor(self.executor, tagger.tag_many, self, list(texts)))
+			# Tokenise the texts and find the readings of their tokens in the executor
+			outputs, tokenised_files, tagged_tokens, cg_mapper, cg_readings = await loop.run_in_executor(self.executor, self.find_readings, list(texts))
+			# If none of the texts have any tokens, there is nothing to tag
+			if len(tagged_tokens) == 0:
+				return(outputs)
+			# Run the readings through CG-3 without blocking the event loop
+			cg_output = await self.cg_pool.run(cg_readings)
+			# Map CG-3's output back to the tokens in the executor, and return the tagged output objects
+			return(await loop.run_in_executor(self.executor, self.map_output, outputs, tokenised_files, tagged_tokens, cg_mapper, cg_output))
+
+	def find_readings(self, texts):
+		# Split each text into a tokenised output object of its own, and find the CG-formatted readings of every token (with each text as a separate document) - passing the sentences that CG-3 can't change straight to the mapper, if they are being resolved without CG-3
+		outputs, tokenised_files = tokenise_documents(texts)
+		tagged_tokens, reading_counts, sentence_counts = [], {"with_readings": 0, "without_readings": 0, "guessed_pns": 0}, {"sentences": 0, "bypassed": 0}
+		cg_mapper = cgoutputmapper(tagged_tokens)
+		sentence_readings = generate_document_readings(tokenised_files, tagged_tokens, reading_counts)
+		cg_readings = "".join(skip_unambiguous_sentences(sentence_readings, cg_mapper, sentence_counts) if self.resources.cg_skip_unambiguous == True else sentence_readings)
+		return(outputs, tokenised_files, tagged_tokens, cg_mapper, cg_readings)
+
+	def map_output(self, outputs, tokenised_files, tagged_tokens, cg_mapper, cg_output):
+		# Map each line of CG-3's output back to the tokens, and return None if CG-3 did not return CG-formatted readings
+		for line in cg_output:
+			cg_mapper.add_line(line)
+		cg_mapper.finish_cohort()
+		if check_cg_output(cg_mapper) != None:
+			return
+		# Find the lemma and POS tags of each token that is still without POS tags, and store each document's tagged tokens in its own output object
+		final_pass(cg_mapper, tagged_tokens, tokenised_files)
+		return(store_documents(outputs, tagged_tokens))
+
+	async def close(self):
+		# Stop the CG-3 processes started by the event loop (which must be done before the tagger is used from another event loop)
+		if self.cg_pool != None:
+			await self.cg_pool.close()
+
+async def tag_texts(texts):
+	# Tag each text as a separate request (all at once, within the concurrency limit), and return the tagged output objects
+	cytagger = asynctagger()
+	try:
+		return(await asyncio.gather(*[cytagger.tag(text) for text in texts]))
+	finally:
+		await cytagger.close()
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# Alert the user if no text was passed
+	if len(args) == 0:
+		print("ARGUMENT ERROR: One or more strings of Welsh text should be passed. The correct formatting of arguments is: TEXT [TEXT ...]")
+	else:
+		# Tag the texts, and print each output to standard output
+		for output in asyncio.run(tag_texts(args)):
+			if output != None:
+				output.print_to_stdout()
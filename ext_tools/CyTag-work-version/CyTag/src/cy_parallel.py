@@ -0,0 +1,104 @@
+#!usr/bin/env python3
+#-*- coding: utf-8 -*-
+"""
+'cy_parallel.py'
+
+Runs the CyTag pipeline (up to the tokeniser or the POS tagger) over a number of input files in a pool of worker processes, merging the output for each file into a single cy_taggedobject. Only the tagged output is returned from each worker - the '_readings' and '_readingsPostCG' debug files, the 'unknown_words' list and the statistics about token readings are not produced.
+
+Accepts as arguments:
+	--- REQUIRED: The number of worker processes to use.
+	--- REQUIRED: One or more Welsh input text files (raw text).
+
+Returns:
+	--- cy_taggedobject with each input file segmented, sentences split, tokenised, and POS tagged, with corpus-wide sentence numbers.
+
+Developed at Cardiff University as part of the CorCenCC project (www.corcencc.org).
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License or (at your option) any later version.
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with this program. If not, see <http://www.gnu.org/licenses>.
+"""
+
+import sys
+import os
+import multiprocessing
+
+try:
+	from progress.bar import Bar
+except ImportError:
+	pass
+
+from cy_taggedobject import taggedobject
+from cy_tokeniser import tokeniser
+from cy_postagger import pos_tag
+from shared.resources import resources
+
+def start_worker():
+	# Forget any CG-3 workers inherited from the parent process, so that each worker process starts (and talks to) its own
+	resources.unload("cg_workers")
+
+def tag_file(task):
+	# Run the pipeline over a single input file, up to the tokeniser or the POS tagger
+	input_file, component = task
+	output = tokeniser([input_file], taggedobject())
+	# If the file is only being tokenised, or has no tokens to tag (e.g. it is empty), return the tokenised output as it is - as it would be merged into the output when the files are tagged together
+	if component == "tok" or output.total_tokens == 0:
+		return(output)
+	# Otherwise, POS tag the tokenised output, and return it (or what was returned instead of a list of tagged tokens, if tagging failed)
+	tagged_tokens = pos_tag(output.total_tokens, output.files, [])
+	if not isinstance(tagged_tokens, list):
+		return(tagged_tokens)
+	output.store_tags(tagged_tokens)
+	return(output)
+
+def run_in_parallel(input_files, component, workers, print_flag=None):
+	# Load every resource the pipeline will need before the worker processes are forked, so that they share them (copy-on-write) rather than each loading their own
+	for resource in ["gazetteers", "abbreviations", "contractions_and_prefixes", "affixes"] + (["lexicon", "coverage", "tagsequences", "vislcg3_location"] + (["hmm_disambiguator"] if resources.disambiguator == "hmm" else []) if component != "tok" else []):
+		getattr(resources, resource)
+	# If the files are being POS tagged with CG-3 and VISL CG-3 was not located, print a warning that VISL CG-3 is not installed, and return
+	if component != "tok" and resources.can_disambiguate() == False:
+		print("\nERROR: VISL CG-3 could not be found, and is required to continue using CyTag. Please follow the instructions in the README file to install it\n")
+		return
+	# If worker processes can't be forked on this platform, run the pipeline over each file in turn instead
+	try:
+		context = multiprocessing.get_context("fork")
+	except ValueError:
+		context, workers = None, 1
+	# Create an empty output object, and (if output details are being printed) a bar to show the progress of processing the files
+	output = taggedobject()
+	files_bar = None
+	if print_flag != None:
+		print("\nRunning CyTag over {} files, using {} worker processes\n".format(len(input_files), workers))
+		files_bar = Bar("Processing files", max=len(input_files))
+	tasks = [(input_file, component) for input_file in input_files]
+	# Process the files in the pool of worker processes (in order), and merge the output for each file into the output object
+	pool = context.Pool(workers, initializer=start_worker) if workers > 1 else None
+	try:
+		for file_output in (pool.imap(tag_file, tasks) if pool != None else map(tag_file, tasks)):
+			# If a file couldn't be processed (e.g. CG-3 returned an error), stop and return
+			if not isinstance(file_output, taggedobject):
+				print("\nERROR: The input files could not all be processed ({})\n".format(file_output))
+				return
+			output.merge(file_output)
+			if files_bar != None:
+				files_bar.next()
+	finally:
+		if pool != None:
+			pool.terminate()
+	# If the progress bar for processing files was created, finish it
+	if files_bar != None:
+		files_bar.finish()
+	# Return the output object
+	return(output)
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# If the first argument is not a number of workers, or no input files were given, alert the user to the correct formatting of arguments
+	if len(args) < 2 or args[0].isdigit() != True or int(args[0]) < 1 or False in [os.path.isfile(arg) for arg in args[1:]]:
+		print("ARGUMENT ERROR: The number of worker processes to use and one or more input files should be passed. The correct formatting of arguments is: WORKERS INPUT_FILES")
+	# Otherwise, POS tag the input files and print the output to standard output
+	else:
+		output = run_in_parallel(args[1:], "pos", int(args[0]))
+		if output == None:
+			sys.exit(1)
+		output.print_to_stdout()
@@ -0,0 +1,175 @@
+#!usr/bin/env python3
+#-*- coding: utf-8 -*-
+"""
+'cy_pipeline.py'
+
+A streaming version of the CyTag pipeline (text segmentation -> sentence splitting -> tokenisation -> part-of-speech (POS) tagging), in which each component is a generator over segments (paragraphs) rather than building a cy_taggedobject for the whole corpus. Output is written as each segment is finished, so that corpora of any size can be processed in (roughly) constant memory.
+
+Each segment is passed between components as a list of: [file id, file name, segment id (within the file), contents] - where the contents are the segment's text, then a list of its sentences, then a list of each sentence's tokens, and finally a list of each sentence's tagged tokens. Files without any segments are passed as a single segment with an id (and contents) of 'None', so that they still appear in the output.
+
+Accepts as arguments:
+	--- REQUIRED: One or more Welsh input text files (raw text).
+	--- REQUIRED: A name to describe the corpus and its output files.
+	--- OPTIONAL: A directory in which output files will be saved.
+	--- REQUIRED: A format to write the pipeline's output ('tsv', 'xml' or 'all')
+
+Developed at Cardiff University as part of the CorCenCC project (www.corcencc.org).
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License or (at your option) any later version.
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with this program. If not, see <http://www.gnu.org/licenses>.
+"""
+
+import sys
+import os
+
+from cy_taggedobject import outputwriter
+from cy_sentencesplitter import split_segment
+from cy_tokeniser import tokenise_sentence
+from cy_postagger import pos_tag
+from shared.get_lines import iterate_lines
+from shared.resources import resources
+
+# The minimum number of sentences to POS tag at a time, and the tokens that end a CG-3 window (the grammar's delimiters)
+tag_batch_sentences = 1000
+window_delimiters = [".", "!", "?"]
+
+def stream_segments(input_data):
+	# Yield each line of the input data (a list of files, or a string) as a segment
+	for file_id, file_name, segment_id, segment in iterate_lines(input_data):
+		yield([file_id, file_name, segment_id, segment])
+
+def stream_sentences(segments):
+	# Find the terms in the 'abbreviations' gazetteer (grouped by length)
+	abbreviations = resources.abbreviations
+	# Split each segment into sentences
+	for segment in segments:
+		if segment[2] != None:
+			segment[3] = split_segment(segment[3], abbreviations)
+		yield(segment)
+
+def stream_tokens(segments):
+	# Create variables to store the total numbers of sentences and tokens, carried across segments (and files)
+	total_sentences, total_tokens = 0, 0
+	# For each segment, tokenise each of its sentences, recording the location and position of each token
+	for segment in segments:
+		if segment[2] != None:
+			tokenised_sentences = []
+			for sentence_id, sentence in enumerate(segment[3]):
+				total_sentences += 1
+				tokens = tokenise_sentence(sentence, [segment[0], segment[2], sentence_id], total_sentences, total_tokens)
+				total_tokens += len(tokens)
+				tokenised_sentences.append(tokens)
+			segment[3] = tokenised_sentences
+		yield(segment)
+
+def stream_tags(segments, batch_sentences=tag_batch_sentences):
+	# Create an empty batch of segments, and variables for the number of sentences in the batch and in all previous batches
+	batch, batch_length, sentence_offset = [], 0, 0
+	# Create a variable to record whether the last token so far left a CG-3 window open (i.e. it wasn't one of the grammar's delimiters)
+	window_open = False
+	for segment in segments:
+		batch.append(segment)
+		if segment[2] != None:
+			batch_length += len(segment[3])
+			for tokens in segment[3]:
+				if len(tokens) > 0:
+					window_open = tokens[-1][0] not in window_delimiters
+		# Once the batch is large enough and doesn't end part of the way through a CG-3 window, POS tag it and pass on its segments
+		if batch_length >= batch_sentences and window_open == False:
+			if tag_batch(batch, sentence_offset) != True:
+				return
+			for tagged_segment in batch:
+				yield(tagged_segment)
+			batch, batch_length, sentence_offset = [], 0, sentence_offset + batch_length
+	# POS tag the final batch and pass on its segments
+	if len(batch) > 0 and tag_batch(batch, sentence_offset) == True:
+		for tagged_segment in batch:
+			yield(tagged_segment)
+
+def tag_batch(batch, sentence_offset):
+	# Arrange the batch's tokens as a single tokenised file (as used by 'pos_tag'), pointing each token's location at its place in the batch
+	batch_segments = [segment for segment in batch if segment[2] != None]
+	tokenised_file, token_count = ["batch", len(batch_segments), []], 0
+	for batch_segment_id, segment in enumerate(batch_segments):
+		for sentence_id, tokens in enumerate(segment[3]):
+			for token in tokens:
+				token[1]["location"] = [0, batch_segment_id, sentence_id]
+			token_count += len(tokens)
+		tokenised_file[2].append([len(segment[3]), [[len(tokens), tokens] for tokens in segment[3]]])
+	# POS tag the batch (following on from the sentences in previous batches), and return if anything other than a list of tagged tokens was returned
+	tagged_tokens = pos_tag(token_count, [tokenised_file], [], sentence_offset)
+	if not isinstance(tagged_tokens, list):
+		return(False)
+	# Replace the tokens in each segment with the tagged tokens, restoring their locations within the corpus
+	tagged_tokens = iter(tagged_tokens)
+	for segment in batch_segments:
+		segment[3] = [[next(tagged_tokens) for token in tokens] for tokens in segment[3]]
+		for sentence_id, tokens in enumerate(segment[3]):
+			for token in tokens:
+				token[1] = [segment[0], segment[2], sentence_id]
+	return(True)
+
+def stream_to_file(segments, output_name, directory, output_format):
+	# Create an output writer for the appropriate file format(s), and return if it couldn't be created
+	writer = outputwriter(output_name, directory, output_format)
+	if writer.ready != True:
+		return
+	# Write each segment as it arrives, starting and ending files as the segments move from one file to the next
+	current_file = None
+	for segment in segments:
+		if segment[0] != current_file:
+			if current_file != None:
+				writer.end_file()
+			writer.start_file(segment[0], segment[1])
+			current_file = segment[0]
+		if segment[2] != None:
+			writer.write_segment(segment[2], segment[3])
+	if current_file != None:
+		writer.end_file()
+	# Finish writing the output files, and return the writer (with its totals)
+	writer.close()
+	return(writer)
+
+def stream_to_stdout(segments):
+	# Create a variable to store the total number of tokens
+	total_tokens = 0
+	# Print tab-separated information about each tagged token to standard output, as each segment arrives
+	for segment in segments:
+		if segment[2] != None:
+			for tokens in segment[3]:
+				for token in tokens:
+					total_tokens += 1
+					mutation = "+{}".format(token[6]) if len(token) == 7 else ""
+					print("{}\t{}\t{}\t{}\t{}\t{}\t{}".format(total_tokens, token[0], token[2], token[3], token[4], token[5], mutation))
+
+def run_pipeline(input_data, output_name=None, directory=None, component=None, output_format=None):
+	# If the pipeline is being run to the POS tagger with CG-3 and VISL CG-3 was not located, print a warning that VISL CG-3 is not installed, and return
+	if component in [None, "pos"] and resources.can_disambiguate() == False:
+		print("\nERROR: VISL CG-3 could not be found, and is required to continue using CyTag. Please follow the instructions in the README file to install it\n")
+		return
+	# Chain the components of the pipeline together, up to the given component
+	segments = stream_tokens(stream_sentences(stream_segments(input_data)))
+	if component in [None, "pos"]:
+		segments = stream_tags(segments)
+	# If no output name was given, print the tagged tokens to standard output
+	if output_name == None:
+		stream_to_stdout(segments)
+	# Otherwise, write the output to the appropriate file format(s) and print the totals
+	else:
+		writer = stream_to_file(segments, output_name, directory, output_format)
+		if writer != None:
+			print("\nWrote {} tokens ({} sentences, {} segments) to CyTag/outputs/{}\n".format(writer.total_tokens, writer.total_sentences, writer.total_segments, directory if directory != None else output_name))
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# Cycle through the arguments and split the input files and the text arguments into separate lists
+	input_files, text_args = [], []
+	for arg in args:
+		input_files.append(arg) if os.path.isfile(arg) else text_args.append(arg)
+	# Alert the user if there are no input files, or if the text arguments are not an output name, an (optional) output directory and an output format
+	if len(input_files) == 0 or len(text_args) not in [2, 3] or text_args[-1] not in ["tsv", "xml", "all"]:
+		print("ARGUMENT ERROR: One or more input files, an output filename, and an output format ('tsv', 'xml' or 'all') must be specified. An optional output directory can also be specified.")
+	# Otherwise, run the streaming pipeline over the input files
+	else:
+		run_pipeline(input_files, text_args[0], text_args[1] if len(text_args) == 3 else None, None, text_args[-1])
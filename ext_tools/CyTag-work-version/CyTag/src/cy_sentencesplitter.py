@@ -29,39 +29,40 @@ import re
 from cy_taggedobject import taggedobject
 from shared.create_folders import *
 from cy_textsegmenter import segment_text
-from shared.load_gazetteers import *
+from shared.resources import resources
+
+# A regex pattern for candidate sentence boundaries - whitespace preceded by certain punctuation marks, but not by certain combinations of letters and punctuation marks
+boundary_pattern = re.compile("(?<=[.|!|?])(?<!\s[A-Z][.])(?<![A-Z][.][A-Z][.])(?<![.]\s[.])(?<![.][.])[\s]")
+
+def split_segment(segment, abbreviations):
+	# Create an empty list to hold the split sentences, and a variable for the start of the current sentence
+	sentences, start = [], 0
+	# For each candidate sentence boundary in the segment...
+	for boundary in boundary_pattern.finditer(segment):
+		position = boundary.start()
+		# If the text before the boundary ends with one of the terms in the 'abbreviations' gazetteer (checking the set of terms of each length), it is not a sentence boundary
+		if any(segment[position-length:position] in terms for length, terms in abbreviations.items() if length <= position):
+			continue
+		# Otherwise, split the current sentence off at the boundary (leaving out the whitespace), and start the next sentence after it
+		sentences.append(segment[start:position])
+		start = position+1
+	sentences.append(segment[start:])
+	# Return the split sentences, without any empty sentences
+	return([sentence for sentence in sentences if sentence != ""])
 
 def split_sentences(segmented_files):
 	# Create an empty list to hold the split sentences
 	split_sentences = []
-	# Load the appropriate gazetteers
-	gazetteers = load_gazetteers()
+	# Find the terms in the 'abbreviations' gazetteer (grouped by length)
+	abbreviations = resources.abbreviations
 	# For each segmented file passed to the split_sentences function...
 	for file_id, file in enumerate(segmented_files):
 		# Append an empty list to the list of split sentences
 		split_sentences.append([])
 		# For each segment in this file...
 		for segment in file[2]:
-			# Split the given segment into sentences based on a regex pattern - whitespace preceded by certain punctuation marks, but not by certain combinations of letters and punctuation marks or by any of the negative lookbehind assertions created for the 'abbreviations' gazetteer
-			pattern = gazetteers["abbreviations_regex"] + "(?<=[.|!|?])(?<!\s[A-Z][.])(?<![A-Z][.][A-Z][.])(?<![.]\s[.])(?<![.][.])[\s]"
-			sentences = re.split(pattern, segment)
-			# Create a variable 'k' and iterate through the split sentences...
-			k = 0
-			while k < len(sentences):
-				# If an empty sentence is encountered, delete it
-				if sentences[k] == "":
-					del sentences[k] 
-				else:
-					# If we are not on the last sentence...
-					if k < len(sentences)-1:
-						# If the next sentence splits according to the regex pattern...
-						if re.match(pattern, sentences[k+1]):
-							# Append the next sentence to the current one and then delete it
-							sentences[k] = sentences[k] + sentences[k+1].strip()
-							del sentences[k+1]
-					k+=1
-			# Append the split sentences to the appropriate file in the wider split sentences list
-			split_sentences[file_id].append(sentences)
+			# Split the segment into sentences, and append them to the appropriate file in the wider split sentences list
+			split_sentences[file_id].append(split_segment(segment, abbreviations))
 	# Return the list of split sentences
 	return(split_sentences)
 
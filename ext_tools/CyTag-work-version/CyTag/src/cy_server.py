@@ -0,0 +1,154 @@
+#!usr/bin/env python3
+#-*- coding: utf-8 -*-
+"""
+'cy_server.py'
+
+A long-running CyTag server, which keeps the lexicon, gazetteers and other resources loaded between requests.
+
+Serves:
+	--- GET /rest/pos/<URL-encoded Welsh text> (as used by CySemTagger's 'CyTagServiceWrapper') - returns TSV values for each token, as CyTag does on standard output.
+	--- POST /rest/pos, with a JSON body of the form {"text": <Welsh text>} - returns a JSON object with a list of tokens.
+
+Accepts as arguments:
+	--- OPTIONAL: An address to listen on - a port, a host and port ('localhost:8080'), or the path to a Unix socket. Defaults to 'localhost:8080'.
+	--- OPTIONAL: '--workers N', to keep N CG-3 workers running, so that up to N requests are tagged at once. Defaults to 4.
+
+Developed at Cardiff University as part of the CorCenCC project (www.corcencc.org).
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License or (at your option) any later version.
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with this program. If not, see <http://www.gnu.org/licenses>.
+"""
+
+import sys
+import os
+import json
+import stat
+import socketserver
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+from cy_tagger import tagger
+from shared.resources import resources
+
+# The path under which the POS tagger is served
+rest_path = "/rest/pos"
+
+# The tagger used to tag the text sent to the server (created when the server starts)
+server_tagger = None
+
+# The default number of CG-3 workers kept running by the server (i.e. the number of requests that can be tagged at once)
+default_workers = 4
+
+def tag_text(text):
+	# Run the POS tagger over the (already decoded) text, and return the tagged output object (or None if tagging failed)
+	return(server_tagger.tag(text))
+
+def tag_texts(texts):
+	# Run the POS tagger over a list of (already decoded) texts in one pass through CG-3, and return a tagged output object for each (or None if tagging failed)
+	return(server_tagger.tag_many(texts))
+
+def token_details(output):
+	# Find the details of each token in a tagged output object, for returning as JSON
+	return([{"id": row[0], "token": row[1], "position": row[2], "lemma": row[3], "basic_pos": row[4], "rich_pos": row[5], "mutation": row[6]} for row in output.tsv_rows()])
+
+class cytaghandler(BaseHTTPRequestHandler):
+	def do_GET(self):
+		# Only serve the REST path, with the text to be tagged (URL-encoded) following it
+		if not self.path.startswith("{}/".format(rest_path)):
+			self.send_error(404, "Text should be sent to {}/<URL-encoded text>".format(rest_path))
+			return
+		# Decode the text once here - it isn't URL-decoded again when it is tagged
+		text = parse.unquote_plus(self.path[len(rest_path)+1:])
+		output = tag_text(text)
+		if output == None:
+			self.send_error(503, "CyTag was unable to tag the text (is VISL CG-3 installed?)")
+			return
+		# Return the TSV values for each token, as they would be printed to standard output
+		self.send_text("".join("{}\t{}\t{}\t{}\t{}\t{}\t{}\n".format(*row) for row in output.tsv_rows()), "text/plain; charset=utf-8")
+
+	def do_POST(self):
+		# Only serve the REST path
+		if self.path.rstrip("/") != rest_path:
+			self.send_error(404, "Text should be sent to {}".format(rest_path))
+			return
+		# Read the JSON body, and check that it contains the text (or a list of texts) to be tagged
+		try:
+			body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8"))
+			texts = body["texts"] if "texts" in body else [body["text"]]
+			if not isinstance(texts, list) or False in [isinstance(text, str) for text in texts]:
+				raise TypeError
+		except (ValueError, KeyError, TypeError):
+			self.send_error(400, "The request body should be a JSON object of the form {\"text\": <Welsh text>} or {\"texts\": [<Welsh text>, ...]}")
+			return
+		# Tag a single text on its own, or a list of texts together in one pass through CG-3
+		outputs = [tag_text(texts[0])] if "texts" not in body else tag_texts(texts)
+		if outputs == None or None in outputs:
+			self.send_error(503, "CyTag was unable to tag the text (is VISL CG-3 installed?)")
+			return
+		# Return the details of each token as JSON (for each text, if a list of texts was sent)
+		if "texts" in body:
+			self.send_text(json.dumps({"documents": [{"tokens": token_details(output)} for output in outputs]}, ensure_ascii=False), "application/json; charset=utf-8")
+		else:
+			self.send_text(json.dumps({"tokens": token_details(outputs[0])}, ensure_ascii=False), "application/json; charset=utf-8")
+
+	def send_text(self, text, content_type):
+		# Send a successful response with the given (UTF-8 encoded) body
+		body = text.encode("utf-8")
+		self.send_response(200)
+		self.send_header("Content-Type", content_type)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def address_string(self):
+		# Clients connecting over a Unix socket have no address
+		return(self.client_address[0] if isinstance(self.client_address, tuple) else "unix")
+
+class unixhttpserver(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+	daemon_threads = True
+
+def create_server(address):
+	# If the address is a path, serve over a Unix socket (removing any stale socket left behind by a previous server - but never any other kind of file, which would be refused)
+	if "/" in address:
+		if os.path.exists(address):
+			if not stat.S_ISSOCK(os.stat(address).st_mode):
+				return(None)
+			os.remove(address)
+		return(unixhttpserver(address, cytaghandler))
+	# Otherwise, serve over TCP on the given host (localhost by default) and port
+	host, _, port = address.rpartition(":")
+	return(ThreadingHTTPServer((host if host != "" else "localhost", int(port)), cytaghandler))
+
+def serve(address="localhost:8080", workers=default_workers):
+	# Create the tagger up front (loading every resource and starting the given number of CG-3 workers, if VISL CG-3 is installed), so that the first request doesn't pay for it - requests are handled in separate threads, each using an idle CG-3 worker (or as many as it is sharded across, if 'cg_shards' is more than 1), and wait for one if they are all busy
+	global server_tagger
+	server = create_server(address)
+	# If the server couldn't be created at the address (as a file that isn't a socket is already there), print an error and exit without starting
+	if server == None:
+		print("\nERROR: '{}' already exists and is not a socket, so the server was not started (to serve over a Unix socket, please give a path with no file at it, or that of a socket left behind by a previous server)\n".format(address))
+		sys.exit(1)
+	server_tagger = tagger(max(workers, resources.cg_shards))
+	print("CyTag server listening on {} (GET {}/<text>, POST {})".format(address, rest_path, rest_path))
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# If a number of CG-3 workers was passed, remove it from the arguments and record it
+	workers = default_workers
+	if "--workers" in args:
+		option_index = args.index("--workers")
+		option_value = args[option_index+1] if option_index+1 < len(args) else ""
+		if option_value.isdigit() != True or int(option_value) < 1:
+			print("ARGUMENT ERROR: '--workers' should be followed by the number of CG-3 workers to run (1 or more).")
+			sys.exit(1)
+		workers = int(option_value)
+		del args[option_index:option_index+2]
+	# Serve on the given address, or on the default address if none was given
+	serve(args[0], workers) if len(args) > 0 else serve(workers=workers)
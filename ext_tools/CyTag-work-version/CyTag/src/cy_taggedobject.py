@@ -87,7 +87,33 @@ class taggedobject:
 				# Append the passed (tagged) token to the appropriate sentence in this tagged object
 				self.files[token[1][0]][2][token[1][1]][1][token[1][2]][1].append(token)
 
-	def print_to_stdout(self):
+	def merge(self, other):
+		# Find the number of files and sentences already in this tagged object
+		file_offset, sentence_offset = len(self.files), self.total_sentences
+		# For each file in the other tagged object (e.g. one produced in a separate process)...
+		for file in other.files:
+			# For each token in the file (if it has been tokenised)...
+			for segment in file[2]:
+				for sentence in segment[1] if isinstance(segment, list) else []:
+					for token in sentence[1] if isinstance(sentence, list) else []:
+						# Find the token's location and position, whether it is a tokenised token (with an attribute dictionary) or a tagged token
+						location, position = (token[1]["location"], token[1]["position"]) if isinstance(token[1], dict) else (token[1], token[2])
+						# Move the token's location to the file's place in this tagged object, and shift its (corpus-wide) sentence number to follow on from the sentences already in this tagged object
+						location[0] += file_offset
+						position = "{},{}".format(int(position.split(",")[0]) + sentence_offset, position.split(",")[1])
+						if isinstance(token[1], dict):
+							token[1]["position"] = position
+						else:
+							token[2] = position
+			# Append the file to the list of files in this tagged object
+			self.files.append(file)
+		# Increment the total numbers of files, segments, sentences and tokens by those in the other tagged object
+		self.total_files += other.total_files
+		self.total_segments += other.total_segments
+		self.total_sentences += other.total_sentences
+		self.total_tokens += other.total_tokens
+
+	def tsv_rows(self):
 		# Create a variable to store the total number of tokens
 		total_tokens = 0
 		# For each file in the list of files in this tagged object...
@@ -104,106 +130,151 @@ class taggedobject:
 						lemma, basic_pos, rich_pos, position = token[3], token[4], token[5], token[2]
 						# If mutation information is included with the token, create a variable for it
 						mutation = "+{}".format(token[6]) if len(token) == 7 else ""
-						# Print tab-separated information about the token to standard output
-						print("{}\t{}\t{}\t{}\t{}\t{}\t{}".format(total_tokens, token[0], position, lemma, basic_pos, rich_pos, mutation))
+						# Yield the information about the token
+						yield(total_tokens, token[0], position, lemma, basic_pos, rich_pos, mutation)
+
+	def print_to_stdout(self):
+		# Print tab-separated information about each token to standard output
+		for row in self.tsv_rows():
+			print("{}\t{}\t{}\t{}\t{}\t{}\t{}".format(*row))
 
 	def print_to_file(self, output_name, directory, output_format):
+		# Create an output writer for the appropriate file format(s), and return if it couldn't be created
+		writer = outputwriter(output_name, directory, output_format)
+		if writer.ready != True:
+			return
+		# For each file in the list of files in this tagged object, write each of its sentence split segments
+		for file_id, file in enumerate(self.files):
+			writer.start_file(file_id, file[0])
+			for segment_id, segment in enumerate(file[2]):
+				writer.write_segment(segment_id, [sentence[1] for sentence in segment[1]])
+			writer.end_file()
+		# Finish writing the output files
+		writer.close()
+
+class outputwriter:
+	# Writes CyTag output to TSV and/or XML files incrementally, one segment (paragraph) at a time, keeping count of the segments, sentences and tokens written so far
+	def __init__(self, output_name, directory, output_format):
+		self.output_format = output_format
+		# Create variables to store the total number of segments, sentences, and tokens, and the number of sentences and tokens in the current file
+		self.total_segments, self.total_sentences, self.total_tokens = 0, 0, 0
+		self.file_sentences, self.file_tokens = 0, 0
+		# Create variables for the TSV-formatted and XML-formatted output files, the current file's XML element, and whether its opening tag has been written yet
+		self.tsv_output, self.xml_output = None, None
+		self.file_element, self.file_started, self.files_written = None, False, 0
 		# Create the necessary folders to store output files
 		folders = create_folders([[], output_name, directory])
 		# If any kind of warning of message was returned while creating folders, print it and then return
+		self.ready = folders == None
 		if folders != None:
 			print(folders)
 			return
-		# Create variables to store the total number of segments, sentences, and tokens
-		total_segments, total_sentences, total_tokens = 0, 0, 0
-		# Create variables to to store the lxml element tree or the TSV-formatted output file
-		corpus_element, tsv_output = None, None
-		# If an XML output file is needed...
-		if output_format in ["xml", "all"]:
-			# Create an lxml element for the corpus and add its name to it as an attribute
-			corpus_element = etree.Element("corpus")
-			corpus_element.attrib["name"] = output_name
+		output_path = "{}/../{}/{}/{}".format(os.path.dirname(os.path.abspath(__file__)), "outputs", directory if directory != None else output_name, output_name)
 		# If a TSV output file is needed, create it in the appropriate location
 		if output_format in ["tsv", "all"]:
-			tsv_output = open("{}/../{}/{}/{}.tsv".format(os.path.dirname(os.path.abspath(__file__)), "outputs", directory if directory != None else output_name, output_name), "w")
-		# For each file in the list of files in this tagged object...
-		for file_id, file in enumerate(self.files):
-			# Create variables to store the number of sentences and number of tokens in this file
-			file_sentences, file_tokens = 0, 0
-			# If an XML output file is needed, print the opening tag for this file
-			file_element = None
-			if output_format in ["xml", "all"]:
-				# Create an lxml element for the file and add the relevant details to it as attributes
-				file_element = etree.Element("file")
-				file_element.attrib["id"] = str(file_id+1)
-				file_element.attrib["name"] = os.path.basename(file[0])
-			# For each sentence split segment in this file...
-			for segment_id, segment in enumerate(file[2]):
-				# Increment the total number of segments (paragraphs) by 1
-				total_segments += 1
-				# If an XML output file is needed...
-				paragraph_element = None
-				if output_format in ["xml", "all"]:
-					# Create an lxml element for the paragraph and add the relevant details to it as attributes
-					paragraph_element = etree.Element("paragraph")
-					paragraph_element.attrib["id"] = str(total_segments)
-					paragraph_element.attrib["file_id"] = str(segment_id+1)
-				# For each sentence in this segment...
-				for sentence_id, sentence in enumerate(segment[1]):
-					# Increment the total number of sentences and the number of sentences in this file by 1
-					total_sentences += 1
-					file_sentences += 1
-					# If an XML output file is needed...
-					sentence_element = None
-					if output_format in ["xml", "all"]:
-						# Create an lxml element for the sentence and add the relevant details to it as attributes
-						sentence_element = etree.Element("sentence")
-						sentence_element.attrib["id"] = str(total_sentences)
-						sentence_element.attrib["file_id"] = str(file_sentences)
-						sentence_element.attrib["para_id"] = str(sentence_id+1)
-					# For each token in this sentence...
-					for token_id, token in enumerate(sentence[1]):
-						# Increment the total number of tokens and the number of tokens in this file by 1
-						total_tokens += 1
-						file_tokens += 1
-						# Create variables to store the lemma, basic POS tag and rich POS tag for this token
-						lemma, basic_pos, rich_pos = "", "", ""
-						# Create a variable to store the position for this token
-						position = token[2] if len(token) > 2 else "{},{}".format(total_sentences, token_id+1)
-						# If there are more than 3 values in this token, use these values to populate the lemma, basic POS tag and rich POS tag variables
-						if len(token) > 3:
-							lemma, basic_pos, rich_pos = token[3], token[4], token[5]
-						# If an XML output file is needed...
-						token_element = None
-						if output_format in ["xml", "all"]:
-							# Create an lxml element for the token and add the relevant details to it as attributes
-							token_element = etree.Element("token")
-							token_element.attrib["id"] = str(total_tokens)
-							token_element.attrib["file_id"] = str(file_tokens)
-							token_element.attrib["sent_id"] = str(token_id+1)
-							token_element.attrib["lemma"] = lemma
-							token_element.attrib["basic_pos"] = basic_pos
-							token_element.attrib["rich_pos"] = rich_pos
-							if len(token) == 7:
-								token_element.attrib["mutation"] = token[6]
-							token_element.attrib["position"] = position
-							token_element.text = token[0]
-							sentence_element.append(token_element)
-						# If a TSV output file is needed...
-						if output_format in ["tsv", "all"]:
-							# If the token has 7 values, create a variable to hold mutation details for this token
-							mutation = "+{}".format(token[6]) if len(token) == 7 else ""
-							# Print details of the token to the TSV-formatted output file
-							print("{}\t{}\t{}\t{}\t{}\t{}\t{}".format(total_tokens, token[0], position, lemma, basic_pos, rich_pos, mutation), file=tsv_output)
-		# If an XML output file is needed, append the appropriate XML elements to each other and print the final lxml tree
-					if output_format in ["xml", "all"]:
-						paragraph_element.append(sentence_element)	
-				if output_format in ["xml", "all"]:
-					file_element.append(paragraph_element)		
-			if output_format in ["xml", "all"]:
-				corpus_element.append(file_element)
+			self.tsv_output = open("{}.tsv".format(output_path), "w")
+		# If an XML output file is needed, create it in the appropriate location and write the XML declaration
 		if output_format in ["xml", "all"]:
-			tree = etree.ElementTree(corpus_element)
-			tree.write("{}/../{}/{}/{}.xml".format(os.path.dirname(os.path.abspath(__file__)), "outputs", directory if directory != None else output_name, output_name), pretty_print=True, xml_declaration=True, encoding='UTF-8')
+			self.xml_output = open("{}.xml".format(output_path), "wb")
+			self.xml_output.write(b"<?xml version='1.0' encoding='UTF-8'?>\n")
+			# Create an lxml element for the corpus and add its name to it as an attribute
+			self.corpus_element = etree.Element("corpus")
+			self.corpus_element.attrib["name"] = output_name
+
+	def start_file(self, file_id, file_name):
+		# Reset the number of sentences and number of tokens in this file
+		self.file_sentences, self.file_tokens = 0, 0
+		# If an XML output file is needed...
+		if self.xml_output != None:
+			# If this is the first file, write the opening tag for the corpus
+			if self.files_written == 0:
+				self.xml_output.write(start_tag(self.corpus_element))
+			# Create an lxml element for the file and add the relevant details to it as attributes (its opening tag is written along with its first paragraph)
+			self.file_element = etree.Element("file")
+			self.file_element.attrib["id"] = str(file_id+1)
+			self.file_element.attrib["name"] = os.path.basename(file_name)
+			self.file_started = False
+		self.files_written += 1
+
+	def write_segment(self, segment_id, sentences):
+		# Increment the total number of segments (paragraphs) by 1
+		self.total_segments += 1
+		# If an XML output file is needed...
+		paragraph_element = None
+		if self.xml_output != None:
+			# Create an lxml element for the paragraph and add the relevant details to it as attributes
+			paragraph_element = etree.Element("paragraph")
+			paragraph_element.attrib["id"] = str(self.total_segments)
+			paragraph_element.attrib["file_id"] = str(segment_id+1)
+		# For each sentence (list of tokens) in this segment...
+		for sentence_id, sentence in enumerate(sentences):
+			# Increment the total number of sentences and the number of sentences in this file by 1
+			self.total_sentences += 1
+			self.file_sentences += 1
+			# If an XML output file is needed...
+			sentence_element = None
+			if self.xml_output != None:
+				# Create an lxml element for the sentence and add the relevant details to it as attributes
+				sentence_element = etree.SubElement(paragraph_element, "sentence")
+				sentence_element.attrib["id"] = str(self.total_sentences)
+				sentence_element.attrib["file_id"] = str(self.file_sentences)
+				sentence_element.attrib["para_id"] = str(sentence_id+1)
+			# For each token in this sentence...
+			for token_id, token in enumerate(sentence):
+				# Increment the total number of tokens and the number of tokens in this file by 1
+				self.total_tokens += 1
+				self.file_tokens += 1
+				# Create variables to store the lemma, basic POS tag and rich POS tag for this token
+				lemma, basic_pos, rich_pos = "", "", ""
+				# Create a variable to store the position for this token
+				position = token[2] if len(token) > 2 else "{},{}".format(self.total_sentences, token_id+1)
+				# If there are more than 3 values in this token, use these values to populate the lemma, basic POS tag and rich POS tag variables
+				if len(token) > 3:
+					lemma, basic_pos, rich_pos = token[3], token[4], token[5]
+				# If an XML output file is needed...
+				if self.xml_output != None:
+					# Create an lxml element for the token and add the relevant details to it as attributes
+					token_element = etree.SubElement(sentence_element, "token")
+					token_element.attrib["id"] = str(self.total_tokens)
+					token_element.attrib["file_id"] = str(self.file_tokens)
+					token_element.attrib["sent_id"] = str(token_id+1)
+					token_element.attrib["lemma"] = lemma
+					token_element.attrib["basic_pos"] = basic_pos
+					token_element.attrib["rich_pos"] = rich_pos
+					if len(token) == 7:
+						token_element.attrib["mutation"] = token[6]
+					token_element.attrib["position"] = position
+					token_element.text = token[0]
+				# If a TSV output file is needed...
+				if self.tsv_output != None:
+					# If the token has 7 values, create a variable to hold mutation details for this token
+					mutation = "+{}".format(token[6]) if len(token) == 7 else ""
+					# Print details of the token to the TSV-formatted output file
+					print("{}\t{}\t{}\t{}\t{}\t{}\t{}".format(self.total_tokens, token[0], position, lemma, basic_pos, rich_pos, mutation), file=self.tsv_output)
+		# If an XML output file is needed...
+		if self.xml_output != None:
+			# If this is the file's first paragraph, write the opening tag for the file
+			if self.file_started == False:
+				self.xml_output.write(b"\n  " + start_tag(self.file_element))
+				self.file_started = True
+			# Indent the paragraph as it would be in the pretty-printed corpus, and write it
+			etree.indent(paragraph_element, space="  ", level=2)
+			self.xml_output.write(b"\n    " + etree.tostring(paragraph_element, encoding="UTF-8"))
+
+	def end_file(self):
+		# If an XML output file is needed, write the closing tag for the file (or the file as an empty element, if it had no paragraphs)
+		if self.xml_output != None:
+			self.xml_output.write(b"\n  </file>" if self.file_started else b"\n  " + etree.tostring(self.file_element, encoding="UTF-8"))
 
+	def close(self):
+		# Close the TSV-formatted output file
+		if self.tsv_output != None:
+			self.tsv_output.close()
+		# Write the closing tag for the corpus (or the corpus as an empty element, if it had no files) and close the XML-formatted output file
+		if self.xml_output != None:
+			self.xml_output.write(b"\n</corpus>\n" if self.files_written > 0 else etree.tostring(self.corpus_element, encoding="UTF-8") + b"\n")
+			self.xml_output.close()
 
+def start_tag(element):
+	# Serialise an (empty) lxml element as an opening tag, so that its children can be written after it
+	return(etree.tostring(element, encoding="UTF-8")[:-2] + b">")
@@ -0,0 +1,70 @@
+#!usr/bin/env python3
+#-*- coding: utf-8 -*-
+"""
+'cy_tagger.py'
+
+A reusable part-of-speech (POS) tagger for Welsh texts, for embedding CyTag in other programs and services. A tagger loads every resource the pipeline needs (and starts its CG-3 workers) once, when it is created, and can then be used to tag any number of texts or files - from several threads at once, as nothing is kept between calls.
+
+Accepts as arguments:
+	--- REQUIRED: A string of Welsh language text.
+	or:
+	--- REQUIRED: One or more Welsh input text files (raw text).
+
+Returns:
+	--- Tab-separated information about each POS tagged token, printed to standard output.
+
+Developed at Cardiff University as part of the CorCenCC project (www.corcencc.org).
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation, either version 3 of the License or (at your option) any later version.
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for more details.
+You should have received a copy of the GNU General Public License along with this program. If not, see <http://www.gnu.org/licenses>.
+"""
+
+import sys
+import os
+
+from cy_taggedobject import taggedobject
+from cy_postagger import pos_tagger, tag_many
+from shared.get_lines import decodedtext
+from shared.resources import resources
+
+class tagger:
+	# A reusable POS tagger, which loads its resources once and keeps no state between calls (so that it can be shared between threads)
+	def __init__(self, cg_workers=1):
+		# Load every resource the pipeline will need (the resources are never changed once loaded, so they are shared by every tagger rather than loaded again)
+		self.resources = resources
+		for resource in ["gazetteers", "abbreviations", "contractions_and_prefixes", "affixes", "lexicon", "coverage", "tagsequences", "vislcg3_location"] + (["hmm_disambiguator"] if self.resources.disambiguator == "hmm" else []):
+			getattr(self.resources, resource)
+		# Record whether the readings can be disambiguated (i.e. the hidden Markov model is being used, or VISL CG-3 was found), and if CG-3 is being used, start enough CG-3 workers for the given number of texts to be tagged at once
+		self.ready = self.resources.can_disambiguate()
+		if self.ready == True and self.resources.disambiguator == "cg":
+			self.resources.cg_workers.ensure(cg_workers)
+
+	def tag(self, text):
+		# POS tag a string of Welsh text (as it is - it isn't URL-decoded, as text given on the command line is), and return the tagged output object (or None if tagging failed)
+		return(self.tagged(pos_tagger([decodedtext(text)], None, taggedobject())))
+
+	def tag_files(self, paths):
+		# POS tag one or more Welsh input text files, and return a single tagged output object for all of them (or None if tagging failed)
+		return(self.tagged(pos_tagger([list(paths), None, None], None, taggedobject())))
+
+	def tag_many(self, texts):
+		# POS tag a list of (short) texts together in one pass through CG-3 (each as it is, as with 'tag'), and return a tagged output object for each (or None if tagging failed)
+		outputs = tag_many(list(texts)) if self.ready == True else None
+		return(outputs if isinstance(outputs, list) else None)
+
+	def tagged(self, output):
+		# Return the output object if tagging succeeded, or None if it didn't
+		return(output if isinstance(output, taggedobject) else None)
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# Alert the user if no text or input files were passed
+	if len(args) == 0:
+		print("ARGUMENT ERROR: A string of Welsh text, or one or more input files, should be passed. The correct formatting of arguments is: TEXT or INPUT_FILES")
+	else:
+		# Tag the text (or the input files), and print the output to standard output
+		cytagger = tagger()
+		output = cytagger.tag(args[0]) if len(args) == 1 and os.path.isfile(args[0]) != True else cytagger.tag_files(args)
+		if output != None:
+			output.print_to_stdout()
@@ -25,272 +25,361 @@ You should have received a copy of the GNU General Public License along with thi
 import sys
 import os
 import re
-
-import json
+import functools
 
 from cy_taggedobject import taggedobject
 from shared.create_folders import *
 from cy_sentencesplitter import sentence_splitter
-from shared.load_gazetteers import *
+from shared.resources import resources
+from shared.load_gazetteers import acronym, abbreviation
 
-# Global dictionary for storing the CorCenCC gazetteers and global list for recording anonymised text sections
-gazetteers = load_gazetteers()
-anonymised_sections = []
+# Regular expressions for scanning a sentence into words (runs of non-whitespace characters, joined across whitespace only between two characters that are each followed by a full stop, as in initials such as 'A. B.') - picking out the words made up only of letters, numbers and underscores, which are never split any further - and for finding punctuation marks, initials, ellipses, hyphenated numbers and symbols within tokens (compiled once, rather than for each token)
+word_pattern = re.compile("(?P<plain>\w+)(?!\S)|(?:\S|(?<=\S[.])\s(?=\S[.]))+")
+punctuation_pattern = re.compile("(^[.,:;\"\'!?<>{}()\]\[]|[.,:;\"\'!?<>{}()\]\[]$)")
+initials_pattern = re.compile("(?<![A-Z0-9_])([A-Z0-9_][.](\s*[A-Z0-9_][.])*)")
+ellipsis_pattern = re.compile("[.]{2,}")
+hyphenated_number_pattern = re.compile("\d+(-)\d+")
+symbols_pattern = re.compile("([^\s^.,;:!?\-\'\"<>{}()\[\]^\w])")
 
-# Global dictionary for storing known contractions and prefixes, loaded from an external .json file
-contractions_and_prefixes = {}
-with open("{}/../cy_gazetteers/contractions_and_prefixes.json".format(os.path.dirname(os.path.abspath(__file__)))) as contractionsprefixes_json:
-	contractions_and_prefixes = json.load(contractionsprefixes_json)
+def piece_spans(pieces, start):
+	# Find the (start, end) span of each non-empty piece of a token that has been split into consecutive pieces, counting from the start of the token
+	spans = []
+	for piece in pieces:
+		if piece:
+			spans.append((start, start+len(piece)))
+			start += len(piece)
+	# Return the list of spans
+	return(spans)
 
-def check_punctuation(token):
+def check_punctuation(text, start, end):
+	# Each of the splitting functions takes the text containing a token and the token's span within it, and returns the spans of the tokens it was split into
+	token = text[start:end]
 	try:
-		# If the token has any anonymisation tags, return a list containing only the original token for now (it gets dealt with later in the corcencc_tokenise function)
+		# If the token has any anonymisation tags, return a list containing only the original token for now (it gets dealt with later in the anonymise_spans function)
 		if token[:6] == "<anon>" or token[-7:] == "</anon>":
-			return([token])
+			return([(start, end)])
+		# Find any punctuation marks at the beginning or the end of the token
+		punctuation = punctuation_pattern.findall(token)
 		# If: 
 		#### no punctuation marks are found at the beginning or the end of the token
 		##OR the token IS the punctuation mark
-		##OR the token IS or is preceded by sequences of capital letters/numbers separated by dots
+		# then return a list containing only the original token
+		if len(punctuation) < 1 or token in punctuation:
+			return([(start, end)])
+		# Find any sequences of capital letters/numbers separated by dots
+		initials = initials_pattern.findall(token)
+		# If: 
+		#### the token IS or is preceded by sequences of capital letters/numbers separated by dots
 		##OR the token is in the abbreviations gazetteer 
+		##OR the token is a known contraction or prefix
 		# then return a list containing only the original token
-		elif len(re.findall("(^[.,:;\"\'!?<>{}()\]\[]|[.,:;\"\'!?<>{}()\]\[]$)", token)) < 1 or token in re.findall("(^[.,:;\"\'!?<>{}()\]\[]|[.,:;\"\'!?<>{}()\]\[]$)", token) or (len(re.findall("(?<![A-Z0-9_])([A-Z0-9_][.](\s*[A-Z0-9_][.])*)", token)) > 0 and (re.findall("(?<![A-Z0-9_])([A-Z0-9_][.](\s*[A-Z0-9_][.])*)", token)[0][0] == token)) or token in gazetteers["abbreviations"] or token in contractions_and_prefixes.keys():
-			return([token])
+		if (len(initials) > 0 and initials[0][0] == token) or resources.gazetteer_index.get(token, 0) & abbreviation or token in resources.contractions_and_prefixes:
+			return([(start, end)])
+		# Find the first sequence of 2 or more dots in the token
+		ellipsis = ellipsis_pattern.search(token)
 		# If the token contains a sequence of 2 or more dots... 
-		elif len(re.findall("[.]{2,}", token)) > 0:
+		if ellipsis != None:
 			# If the token IS the sequence of 2 or more dots, return a list containing only the original token
-			if re.findall("[.]{2,}", token)[0] == token:
-				return([token])
+			if ellipsis.group() == token:
+				return([(start, end)])
 			# Otherwise, split the ellipsis (sequence of dots) from the rest of the token, and return a list containing the rest of the token and the separated ellipsis
 			else:
-				ellipsis = re.findall("[.]{2,}", token)[0]
-				return([token[:-len(ellipsis)], ellipsis])
+				return([(start, end-len(ellipsis.group())), (start+ellipsis.start(), start+ellipsis.end())])
 		# Otherwise...
 		else:
-			# If any punctuation marks are found at the beginning or end of the token, split these into a list and remove and empty entries from that list 
-			tokens = re.split("(^[.,:;\"\'!?<>{}()\]\[]|[.,:;\"\'!?<>{}()\]\[]$)", token)
-			tokens = list(filter(None, tokens))
-			# For each new token in the list, if the token is NOT in the acronyms gazetteer, recursively delete token and replace it with the results of this function (check_punctuation)
-			for i, new_token in enumerate(tokens):
-				if new_token not in gazetteers["acronyms"]:
-					del tokens[i]
-					tokens[i:i] = check_punctuation(new_token)
-			# Return the list of tokens (split according to punctuation marks)
-			return(tokens)
+			# Split any punctuation marks found at the beginning or end of the token into their own spans (ignoring any empty pieces)
+			spans = piece_spans(punctuation_pattern.split(token), start)
+			# Check each new token that is NOT in the acronyms gazetteer again with this function (check_punctuation), keeping the first token it is split into and checking the rest of them next
+			checked, pending = [], list(reversed(spans))
+			while len(pending) > 0:
+				span = pending.pop()
+				if resources.gazetteer_index.get(text[span[0]:span[1]], 0) & acronym:
+					checked.append(span)
+				else:
+					separated = check_punctuation(text, span[0], span[1])
+					checked.append(separated[0])
+					pending.extend(reversed(separated[1:]))
+			# Return the list of spans (split according to punctuation marks)
+			return(checked)
 	# If anything went wrong, print the token to the terminal
 	except:
 		print("Error checking punctuation for token:", token)
 
-def separate_elisions(token):
-	# If the token has any anonymisation tags, return a list containing only the original token for now (it gets dealt with later in the corcencc_tokenise function)
+def separate_elisions(text, start, end):
+	token = text[start:end]
+	# If the token has any anonymisation tags, return a list containing only the original token for now (it gets dealt with later in the anonymise_spans function)
 	if token[:6] == "<anon>" or token[-7:] == "</anon>":
-		return([token])
-	# For each term in the list of contractions and prefixes...
-	for term in contractions_and_prefixes.keys():
-		# If the term is a contraction...
-		if contractions_and_prefixes[term][0] == "contraction":
-			# If the token begins with the term and the and the apostrophe appears at the end of the term, split the term and the token and return the two as separate tokens
-			if term[-1:] == "'" and len(re.findall(r"^("+term+")", token)) > 0:
-				separated = re.split(r"^("+term+")", token)
-				separated = list(filter(None, separated))
-				return(separated)
-			# If the token ends with the term and the and the apostrophe appears at the beginning of the term, split the token and the term and return the two as separate tokens
-			if term[:1] == "'" and len(re.findall(r"("+term+")$", token)) > 0:
-				separated = re.split(r"("+term+")$", token)
-				separated = list(filter(None, separated))
-				return(separated)
+		return([(start, end)])
+	# Find the tries of contractions elided at the start and at the end of words
+	affixes = resources.affixes
+	# Find the earliest listed contraction that the token begins with (ending with an apostrophe), and the earliest listed contraction that it ends with (starting with an apostrophe)
+	leading, trailing = affixes["leading"].match(token), affixes["trailing"].match(token)
+	# If the token begins with a contraction listed before any it ends with, split the contraction and the rest of the token and return the two as separate tokens
+	if leading != None and (trailing == None or leading[0] <= trailing[0]):
+		return(piece_spans([token[:leading[1]], token[leading[1]:]], start))
+	# If the token ends with a contraction, split the rest of the token and the contraction and return the two as separate tokens
+	elif trailing != None:
+		return(piece_spans([token[:-trailing[1]], token[-trailing[1]:]], start))
 	# Otherwise, return a list containing only the original token
 	else:
-		return([token])
+		return([(start, end)])
 
-def separate_symbols(token):
-	# If the token has any anonymisation tags, return a list containing only the original token for now (it gets dealt with later in the corcencc_tokenise function)
+def separate_symbols(text, start, end):
+	token = text[start:end]
+	# If the token has any anonymisation tags, return a list containing only the original token for now (it gets dealt with later in the anonymise_spans function)
 	if token[:6] == "<anon>" or token[-7:] == "</anon>":
-		return([token])
-	# If any symbols of interest are part of the token (and the token is not a url containing either 'http' or 'www.'), split them into a list, remove and empty entries from the list, and return the split list
-	if len(re.findall("([^\s^.,:;!?\-\'\"<>{}()\[\]^\w])", token)) > 0 and "http" not in token and "www." not in token: 
-		separated = re.split("([^\s^.,;:!?\-\'\"<>{}()\[\]^\w])", token)
-		separated = list(filter(None, separated))
-		return(separated)
+		return([(start, end)])
+	# If any symbols of interest are part of the token (and the token is not a url containing either 'http' or 'www.'), split them into their own spans (ignoring any empty pieces) and return the list of spans
+	if "http" not in token and "www." not in token and symbols_pattern.search(token) != None: 
+		return(piece_spans(symbols_pattern.split(token), start))
 	# Otherwise, return a list containing only the original token
 	else:
-		return([token])
+		return([(start, end)])
+
+def separate_hyphens(text, start, end):
+	token = text[start:end]
+	# If the token contains a dash with something other than a digit either side of it...
+	if "-" in token and token != "-" and not hyphenated_number_pattern.match(token):
+		# Find the set of known prefixes
+		prefixes = resources.affixes["prefixes"]
+		# If the beginning of the token (up to the first hyphen) is not in the list of prefixes...
+		if token[0:token.index("-")+1] not in prefixes and token[0:token.index("-")+1].lower() not in prefixes:
+			# If there is a dash in the token, split the token (temporarily) on the dash
+			if token.count("-") == 1:
+				token_parts = token.split("-")
+				# If both token parts begin with a capital letter, separate the token (permanently) by splitting on the dash, and return the list of spans
+				if token_parts[0][0].isupper() and token_parts[1][0].isupper():
+					return(piece_spans(token.partition("-"), start))
+	# Otherwise, return a list containing only the original token
+	return([(start, end)])
+
+def split_repeatedly(split, text, span):
+	# Split the token with the given function and keep the first part, then split each of the other parts in the same way (in order)
+	spans, pending = [], [span]
+	while len(pending) > 0:
+		span = pending.pop()
+		separated = split(text, span[0], span[1])
+		# If the token was split, keep the first part, and split the rest of the parts next
+		if len(separated) > 1:
+			spans.append(separated[0])
+			pending.extend(reversed(separated[1:]))
+		# Otherwise, keep the token as it is
+		else:
+			spans.append(span)
+	# Return the list of spans
+	return(spans)
+
+@functools.lru_cache(maxsize=65536)
+def word_spans(word):
+	# Find the spans of the tokens in a word by punctuation marks, then elisions, then hyphens, then symbols - splitting each piece of the word with the next function as soon as it is found - remembering the spans for the most recently seen words, as the same words recur throughout a text
+	spans = []
+	for punctuated in split_repeatedly(check_punctuation, word, (0, len(word))):
+		for elided in split_repeatedly(separate_elisions, word, punctuated):
+			for hyphenated in split_repeatedly(separate_hyphens, word, elided):
+				spans.extend(split_repeatedly(separate_symbols, word, hyphenated))
+	# Return the spans (as a tuple, so that the remembered spans can't be changed)
+	return(tuple(spans))
+
+# The remembered spans were found using the gazetteers, contractions and prefixes, and affixes, so forget them if any of those are reloaded
+resources.add_cache(word_spans.cache_clear, "gazetteers", "gazetteer_index", "contractions_and_prefixes", "affixes")
+
+def token_spans(sentence):
+	# Scan the sentence once, finding the span of each of its tokens - a word made up only of letters, numbers and underscores is a token as it is, and any other word is split into tokens (see 'word_spans')
+	spans = []
+	for word in word_pattern.finditer(sentence):
+		if word.lastgroup == "plain":
+			spans.append(word.span())
+		else:
+			offset = word.start()
+			spans.extend([(offset+start, offset+end) for start, end in word_spans(word.group())])
+	# Return the list of spans
+	return(spans)
+
+def tagged_text(sentence, tagged):
+	# Tokens being anonymised are tagged spans - (prefix, start, end, suffix) - where the prefix and suffix are any anonymisation tags added around the span of the sentence, so find the text of the tagged token
+	prefix, start, end, suffix = tagged
+	return(prefix + sentence[start:end] + suffix)
+
+def trim_tagged(tagged, front, back):
+	# Remove the given numbers of characters from the front and back of a tagged token's text (from its added tags first, and then from the span itself), as slicing its text would
+	prefix, start, end, suffix = tagged
+	removed = min(front, len(prefix))
+	prefix, front = prefix[removed:], front - removed
+	removed = min(front, end - start)
+	start, front = start + removed, front - removed
+	suffix = suffix[front:]
+	removed = min(back, len(suffix))
+	suffix, back = suffix[:len(suffix)-removed], back - removed
+	removed = min(back, end - start)
+	end, back = end - removed, back - removed
+	prefix = prefix[:max(len(prefix)-back, 0)]
+	# Return the trimmed token
+	return((prefix, start, end, suffix))
+
+def split_tagged(split, sentence, tagged):
+	# Split a tagged token with one of the splitting functions - a token with an added tag starts or ends with that tag, so every splitting function leaves it as it is
+	prefix, start, end, suffix = tagged
+	if prefix != "" or suffix != "":
+		return([tagged])
+	return([("", piece_start, piece_end, "") for piece_start, piece_end in split(sentence, start, end)])
+
+def replace_tagged(pending, separated, prefix, suffix):
+	# Add the given tags to each of the tokens that a token was split into, keep the first of them in its place, and put the rest of them next in line to be checked
+	separated = [(prefix + piece_prefix, start, end, piece_suffix + suffix) for piece_prefix, start, end, piece_suffix in separated]
+	pending.extend(reversed(separated[1:]))
+	# Return the token kept in place
+	return(separated[0])
 
-def corcencc_tokenise(sentence, total_tokens):
-	# Create a new list to hold the tokens, and set the anonymisation start and end variables to the current number of total tokens
-	tokens = []
+def anonymise_spans(sentence, spans, total_tokens, anonymised_sections):
+	# Set the anonymisation start and end variables to the current number of total tokens
 	anon_start = anon_end = total_tokens
-	# If the sentence is not empty...
-	if sentence != "":
-		# Split the tokens (using regex) by any whitespace that is not preceded or followed by a non-whitespace character followed by a fullstop.
-		regexed_tokens = re.split("\s(?!\S[.])|(?<!\S[.])\s", sentence)
-		# Remove any null values from the list of tokens
-		tokens = list(filter(None, regexed_tokens))
-		# For each token...
-		for i, token in enumerate(tokens):
+	# Check the tokens in order, keeping each one once it has been checked (so that the number of tokens kept is the position of the current token), with any tokens it is split into checked next
+	anonymised, pending = [], [("", start, end, "") for start, end in reversed(spans)]
+	while len(pending) > 0:
+		i, current = len(anonymised), pending.pop()
+		token = current
+		# If the token starts AND ends with an anonymisation tag...
+		if tagged_text(sentence, token)[:6] == "<anon>" and tagged_text(sentence, token)[-7:] == "</anon>":
+			# Record the current token number as both the start and end point of the anonymised section
+			anon_start = total_tokens + i+1
+			anon_end = total_tokens + i+1
+			# Extract the token without the tags
+			token = trim_tagged(token, 6, 7)
 			# Check whether the token can be split into a group of tokens including punctuation marks
-			checked_tokens = check_punctuation(token)
-			# If the token was split, remove it and replace it with the list of tokens it was split into
+			checked_tokens = split_tagged(check_punctuation, sentence, token)
+			# If the token was split, add anonymisation tags to each of the tokens it was split into, replace the original token with them, and update the end point of the anonymised section accordingly 
 			if len(checked_tokens) > 1:
-				del tokens[i]
-				tokens[i:i] = checked_tokens
-		# For each token...
-		for i, token in enumerate(tokens):
+				current = replace_tagged(pending, checked_tokens, "<anon>", "</anon>")
+				anon_end = total_tokens + i + len(checked_tokens)
+			# Extract the token without the tags
+			token = trim_tagged(current, 6, 7)
 			# Check whether the token can be split into a group of tokens that were joined via elision
-			separated_elisions = separate_elisions(token)
-			# If the token was split, remove it and replace it with the list of tokens it was split into
+			separated_elisions = split_tagged(separate_elisions, sentence, token)
+			# If the token was split, add anonymisation tags to each of the tokens it was split into, replace the original token with them, and update the end point of the anonymised section accordingly 
 			if len(separated_elisions) > 1:
-				del tokens[i]
-				tokens[i:i] = separated_elisions
-		# For each token...
-		for i, token in enumerate(tokens):
-			# If the token contains a dash with something other than a digit either side of it...
-			if "-" in token and token != "-" and not re.match("\d+(-)\d+", token):
-				# Extract all of the prefixes from the list of known contractions and prefixes
-				prefixes = [prefix for prefix in contractions_and_prefixes.keys() if contractions_and_prefixes[prefix][0] == "prefix"]
-				# If the beginning of the token (up to the first hyphen) is not in the list of prefixes...
-				if token[0:token.index("-")+1] not in prefixes and token[0:token.index("-")+1].lower() not in prefixes:
-					# If there is a dash in the token, split the token (temporarily) on the dash
-					if len(re.findall("(-)", token)) == 1:
-						token_parts = token.split("-")
-						# If both token parts begin with a capital letter, separate the token (permanently) by splitting on the dash
-						if token_parts[0][0].isupper() and token_parts[1][0].isupper():
-							separated_token = re.split("(-)", token)
-							# If the token was split, remove it and replace it with the list of tokens it was split into
-							if len(separated_token) > 1:
-								del tokens[i]
-								tokens[i:i] = separated_token
-		# For each token...
-		for i, token in enumerate(tokens):
+				current = replace_tagged(pending, separated_elisions, "<anon>", "</anon>")
+				anon_end = anon_end - 1 + len(separated_elisions)
+			# Extract the token without the tags
+			token = trim_tagged(current, 6, 7)
 			# Check whether the token can be split into a group of tokens including symbols
-			separated_symbols = separate_symbols(token)
-			# If the token was split, remove it and replace it with the list of tokens it was split into
+			separated_symbols = split_tagged(separate_symbols, sentence, token)
+			# If the token was split, add anonymisation tags to each of the tokens it was split into, replace the original token with them, and update the end point of the anonymised section accordingly 
 			if len(separated_symbols) > 1:
-				del tokens[i]
-				tokens[i:i] = separated_symbols
-		# For each token...
-		for i, token in enumerate(tokens):
-			# If the token starts AND ends with an anonymisation tag...
-			if token[:6] == "<anon>" and token[-7:] == "</anon>":
-				# Record the current token number as both the start and end point of the anonymised section
-				anon_start = total_tokens + i+1
-				anon_end = total_tokens + i+1
-				# Extract the token without the tags
-				token = token[6:-7]
-				# Check whether the token can be split into a group of tokens including punctuation marks
-				checked_tokens = check_punctuation(token)
-				# If the token was split, remove it, add anonymistation tags to each of the tokens it was split into, replace the original token with the list of split tokens, and update the end point of the anonymised section accordingly 
-				if len(checked_tokens) > 1:
-					del tokens[i]
-					checked_anon_tokens = []
-					for checked_token in checked_tokens:
-						checked_anon_tokens.append("<anon>{}</anon>".format(checked_token))
-					tokens[i:i] = checked_anon_tokens
-					anon_end = total_tokens + i + len(checked_tokens)
-				# Extract the token without the tags
-				token = tokens[i][6:-7]
-				# Check whether the token can be split into a group of tokens that were joined via elision
-				separated_elisions = separate_elisions(token)
-				# If the token was split, remove it, add anonymistation tags to each of the tokens it was split into, replace the original token with the list of split tokens, and update the end point of the anonymised section accordingly 
-				if len(separated_elisions) > 1:
-					del tokens[i]
-					separated_anon_elisions = []
-					for separated_elision in separated_elisions:
-						separated_anon_elisions.append("<anon>{}</anon>".format(separated_elision))
-					tokens[i:i] = separated_anon_elisions
-					anon_end = anon_end - 1 + len(separated_elisions)
-				# Extract the token without the tags
-				token = tokens[i][6:-7]
-				# Check whether the token can be split into a group of tokens including symbols
-				separated_symbols = separate_symbols(token)
-				# If the token was split, remove it, add anonymistation tags to each of the tokens it was split into, replace the original token with the list of split tokens, and update the end point of the anonymised section accordingly 
-				if len(separated_symbols) > 1:
-					del tokens[i]
-					separated_anon_symbols = []
-					for separated_symbol in separated_symbols:
-						separated_anon_symbols.append("<anon>{}</anon>".format(separated_symbol))
-					tokens[i:i] = separated_anon_symbols
-					anon_end = anon_end - 1 + len(separated_symbols)
-				# Add the current start and end points to the list of anonymised sections
-				anonymised_sections.append([anon_start, anon_end])
-			# If the token starts OR ends with an anonymisation tag...
-			if (token[:6] == "<anon>" and token[-7:] != "</anon>") or (token[:6] != "<anon>" and token[-7:] == "</anon>"):
-				# If the token starts with an anonymisation tag...
-				if token[:6] == "<anon>" and token[-7:] != "</anon>":
-					# Record the current token number as the start point of the anonymised section
-					anon_start = total_tokens + i+1
-					# Remove the anonymisation tag from the start of the token
-					token = token[6:]
-					# Check whether the token can be split into a group of tokens including punctuation marks
-					checked_tokens = check_punctuation(token)
-					# If the token was split, remove it and replace it with the list of tokens it was split into
-					if len(checked_tokens) > 1:
-						del tokens[i]
-						tokens[i:i] = checked_tokens
-					# Set the test token back to the first token of any potential list of split tokens
-					token = tokens[i]
-					# Check whether the token can be split into a group of tokens that were joined via elision
-					separated_elisions = separate_elisions(token)
-					# If the token was split, remove it and replace it with the list of tokens it was split into
-					if len(separated_elisions) > 1:
-						del tokens[i]
-						tokens[i:i] = separated_elisions
-					# Set the test token back to the first token of any potential list of split tokens
-					token = tokens[i]
-					# Check whether the token can be split into a group of tokens including symbols
-					separated_symbols = separate_symbols(token)
-					# If the token was split, remove it and replace it with the list of tokens it was split into
-					if len(separated_symbols) > 1:
-						del tokens[i]
-						tokens[i:i] = separated_symbols
-				# If the token ends with an anonymisation tag...
-				if token[:6] != "<anon>" and token[-7:] == "</anon>":
-					# Record the current token number as the end point of the anonymised section
-					anon_end = total_tokens + i+1
-					# Remove the anonymisation tag from the end of the token
-					token = token[:-7]
-					# Check whether the token can be split into a group of tokens including punctuation marks
-					checked_tokens = check_punctuation(token)
-					# If the token was split, remove it, add anonymistation tags to the end of each of the tokens it was split into, replace the original token with the list of split tokens, and update the end point of the anonymised section accordingly
-					if len(checked_tokens) > 1:
-						del tokens[i]
-						checked_anon_tokens = []
-						for checked_token in checked_tokens:
-							checked_anon_tokens.append("{}</anon>".format(checked_token))
-						tokens[i:i] = checked_anon_tokens
-						anon_end = total_tokens + i + len(checked_tokens)
-					# Set the test token back to the original token minus the anonymisation tag at the end
-					token = tokens[i][:-7]
-					# Check whether the token can be split into a group of tokens that were joined via elision
-					separated_elisions = separate_elisions(token)
-					# If the token was split, remove it, add anonymistation tags to the end of each of the tokens it was split into, replace the original token with the list of split tokens, and update the end point of the anonymised section accordingly
-					if len(separated_elisions) > 1:
-						del tokens[i]
-						separated_anon_elisions = []
-						for separated_elision in separated_elisions:
-							separated_anon_elisions.append("{}</anon>".format(separated_elision))
-						tokens[i:i] = separated_anon_elisions
-						anon_end = anon_end - 1 + len(separated_elisions)
-					# Set the test token back to the original token minus the anonymisation tag at the end
-					token = tokens[i][:-7]
-					# Check whether the token can be split into a group of tokens including symbols
-					separated_symbols = separate_symbols(token)
-					# If the token was split, remove it, add anonymistation tags to the end of each of the tokens it was split into, replace the original token with the list of split tokens, and update the end point of the anonymised section accordingly
-					if len(separated_symbols) > 1:
-						del tokens[i]
-						separated_anon_symbols = []
-						for separated_symbol in separated_symbols:
-							separated_anon_symbols.append("{}</anon>".format(separated_symbol))
-						tokens[i:i] = separated_anon_symbols
-						anon_end = anon_end - 1 + len(separated_symbols)
-					# Add the current start and end points to the list of anonymised sections
-					anonymised_sections.append([anon_start, anon_end])
-		# For each token, remove any anonymisation tags that are still present 
-		for i, token in enumerate(tokens):
-			if token[:6] == "<anon>":
-				token = token[6:]
-			if token[-7:] == "</anon>":
-				token = token[:-7]
-			tokens[i] = token
+				current = replace_tagged(pending, separated_symbols, "<anon>", "</anon>")
+				anon_end = anon_end - 1 + len(separated_symbols)
+			# Add the current start and end points to the sentence's anonymised sections (keeping the first section recorded with a given start point)
+			anonymised_sections.setdefault(anon_start, anon_end)
+		# If the token starts with an anonymisation tag (but doesn't end with one)...
+		if tagged_text(sentence, token)[:6] == "<anon>" and tagged_text(sentence, token)[-7:] != "</anon>":
+			# Record the current token number as the start point of the anonymised section
+			anon_start = total_tokens + i+1
+			# Remove the anonymisation tag from the start of the token
+			token = trim_tagged(token, 6, 0)
+			# Check whether the token can be split into a group of tokens including punctuation marks
+			checked_tokens = split_tagged(check_punctuation, sentence, token)
+			# If the token was split, replace it with the tokens it was split into
+			if len(checked_tokens) > 1:
+				current = replace_tagged(pending, checked_tokens, "", "")
+			# Set the test token back to the first token of any potential list of split tokens
+			token = current
+			# Check whether the token can be split into a group of tokens that were joined via elision
+			separated_elisions = split_tagged(separate_elisions, sentence, token)
+			# If the token was split, replace it with the tokens it was split into
+			if len(separated_elisions) > 1:
+				current = replace_tagged(pending, separated_elisions, "", "")
+			# Set the test token back to the first token of any potential list of split tokens
+			token = current
+			# Check whether the token can be split into a group of tokens including symbols
+			separated_symbols = split_tagged(separate_symbols, sentence, token)
+			# If the token was split, replace it with the tokens it was split into
+			if len(separated_symbols) > 1:
+				current = replace_tagged(pending, separated_symbols, "", "")
+		# If the token ends with an anonymisation tag (but doesn't start with one)...
+		if tagged_text(sentence, token)[:6] != "<anon>" and tagged_text(sentence, token)[-7:] == "</anon>":
+			# Record the current token number as the end point of the anonymised section
+			anon_end = total_tokens + i+1
+			# Remove the anonymisation tag from the end of the token
+			token = trim_tagged(token, 0, 7)
+			# Check whether the token can be split into a group of tokens including punctuation marks
+			checked_tokens = split_tagged(check_punctuation, sentence, token)
+			# If the token was split, add anonymisation tags to the end of each of the tokens it was split into, replace the original token with them, and update the end point of the anonymised section accordingly
+			if len(checked_tokens) > 1:
+				current = replace_tagged(pending, checked_tokens, "", "</anon>")
+				anon_end = total_tokens + i + len(checked_tokens)
+			# Set the test token back to the original token minus the anonymisation tag at the end
+			token = trim_tagged(current, 0, 7)
+			# Check whether the token can be split into a group of tokens that were joined via elision
+			separated_elisions = split_tagged(separate_elisions, sentence, token)
+			# If the token was split, add anonymisation tags to the end of each of the tokens it was split into, replace the original token with them, and update the end point of the anonymised section accordingly
+			if len(separated_elisions) > 1:
+				current = replace_tagged(pending, separated_elisions, "", "</anon>")
+				anon_end = anon_end - 1 + len(separated_elisions)
+			# Set the test token back to the original token minus the anonymisation tag at the end
+			token = trim_tagged(current, 0, 7)
+			# Check whether the token can be split into a group of tokens including symbols
+			separated_symbols = split_tagged(separate_symbols, sentence, token)
+			# If the token was split, add anonymisation tags to the end of each of the tokens it was split into, replace the original token with them, and update the end point of the anonymised section accordingly
+			if len(separated_symbols) > 1:
+				current = replace_tagged(pending, separated_symbols, "", "</anon>")
+				anon_end = anon_end - 1 + len(separated_symbols)
+			# Add the current start and end points to the sentence's anonymised sections (keeping the first section recorded with a given start point)
+			anonymised_sections.setdefault(anon_start, anon_end)
+		anonymised.append(current)
+	# For each token, remove any anonymisation tags that are still present (which leaves only its span of the sentence)
+	spans = []
+	for token in anonymised:
+		if tagged_text(sentence, token)[:6] == "<anon>":
+			token = trim_tagged(token, 6, 0)
+		if tagged_text(sentence, token)[-7:] == "</anon>":
+			token = trim_tagged(token, 0, 7)
+		spans.append((token[1], token[2]))
+	# Return the list of spans
+	return(spans)
+
+def corcencc_tokenise(sentence, total_tokens, anonymised_sections=None):
+	# If one wasn't passed, create a new dictionary to record the start and end points of anonymised sections
+	if anonymised_sections == None:
+		anonymised_sections = {}
+	# If the sentence is empty, there are no tokens
+	if sentence == "":
+		return([])
+	# Find the spans of the tokens in a single scan over the sentence
+	spans = token_spans(sentence)
+	# If any of the tokens have anonymisation tags (which they can only have if the sentence contains one), record the anonymised sections and find the spans of the tokens without their tags
+	if "<anon>" in sentence or "</anon>" in sentence:
+		for start, end in spans:
+			if sentence[start:end][:6] == "<anon>" or sentence[start:end][-7:] == "</anon>":
+				spans = anonymise_spans(sentence, spans, total_tokens, anonymised_sections)
+				break
+	# Return the list of tokens, sliced from the sentence by their spans
+	return([sentence[start:end] for start, end in spans])
+
+def tokenise_sentence(sentence, location, total_sentences, total_tokens):
+	# If the last character is a full stop but it's not preceded by a space, add a space in before the full stop
+	if sentence[-1:] == "." and sentence[-2:] != " .":
+		sentence = "{}{}".format(sentence[:-1], " .")
+	# Run the corcencc_tokenise function over the sentence to return a list of tokens, recording the start and end points of any anonymised sections within it
+	anonymised_sections = {}
+	tokens = corcencc_tokenise(sentence, total_tokens, anonymised_sections)
+	# Create start and end variables
+	start, end = 0, 0
+	# For each token in the list...
+	for token_id, token in enumerate(tokens):
+		# Replace the token itself with a list, containing the token and a dictionary to hold attributes about it
+		tokens[token_id] = [token, {}]
+		# If the current token is the start point of an anonymised section, set the start and end variables to the start and end points of that section
+		if (total_tokens + token_id+1) in anonymised_sections:
+			start = total_tokens + token_id+1
+			end = anonymised_sections[start]
+		# If the token number is greater than the end variable and the end variable is not 0, reset the start variable to 0
+		if (total_tokens + token_id+1 > end and end != 0):
+			start = 0
+		# Attach keys for the 'location' (within the cy_taggedobject structure) and 'position' (sentence,token) of the token to its attribute dictionary
+		tokens[token_id][1]["location"] = list(location)
+		tokens[token_id][1]["position"] = "{},{}".format(total_sentences, token_id+1)
+		# If the token number is greater than or equal to the start variable and the start variable is not 0, attach an 'anon' key with a value of 'true' to the token's attribute dictionary
+		if (total_tokens + token_id+1 >= start and start != 0):
+			tokens[token_id][1]["anon"] = "true"	
 	# Return the list of tokens
 	return(tokens)
 
@@ -310,33 +399,8 @@ def tokenise(sentencesplit_files):
 			# For each sentence in this segment...
 			for sentence_id, sentence in enumerate(segment[1]):
 				total_sentences += 1
-				# If the last character is a full stop but it's not preceded by a space, add a space in before the full stop
-				if sentence[-1:] == "." and sentence[-2:] != " .":
-					sentence = "{}{}".format(sentence[:-1], " .")
-				# Run the corcencc_tokenise function over the sentence to return a list of tokens
-				tokens = corcencc_tokenise(sentence, total_tokens)
-				# Create separate arrays of start and end points for anonymised sections
-				anon_starts = [x[0] for x in anonymised_sections]
-				anon_ends = [x[1] for x in anonymised_sections]
-				# Create start and end variables
-				start, end = 0, 0
-				# For each token in the list...
-				for token_id, token in enumerate(tokens):
-					# Replace the token itself with a list, containing the token and a dictionary to hold attributes about it
-					tokens[token_id] = [token, {}]
-					# If the current token is in the array of start points for anonymised sections, set the start and end variables to the appropriate index in the start and end point arrays
-					if (total_tokens + token_id+1) in anon_starts:
-						start = anon_starts[anon_starts.index(total_tokens + token_id+1)]
-						end = anon_ends[anon_starts.index(total_tokens + token_id+1)]
-					# If the token number is greater than the end variable and the end variable is not 0, reset the start variable to 0
-					if (total_tokens + token_id+1 > end and end != 0):
-						start = 0
-					# Attach keys for the 'location' (within the cy_taggedobject structure) and 'position' (sentence,token) of the token to its attribute dictionary
-					tokens[token_id][1]["location"] = [file_id, segment_id, sentence_id]
-					tokens[token_id][1]["position"] = "{},{}".format(total_sentences, token_id+1)
-					# If the token number is greater than or equal to the start variable and the start variable is not 0, attach an 'anon' key with a value of 'true' to the token's attribute dictionary
-					if (total_tokens + token_id+1 >= start and start != 0):
-						tokens[token_id][1]["anon"] = "true"	
+				# Tokenise the sentence, recording the location and position of each token
+				tokens = tokenise_sentence(sentence, [file_id, segment_id, sentence_id], total_sentences, total_tokens)
 				# Increment the total number of tokens by the number of tokens in this sentence
 				total_tokens += len(tokens)
 				# Add the tokens to the appropriate segment in the appropriate file in the wider split tokens list
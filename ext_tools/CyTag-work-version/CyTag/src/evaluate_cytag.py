@@ -21,6 +21,7 @@ You should have received a copy of the GNU General Public License along with thi
 
 import sys
 import os
+import time
 
 try:
 	import numpy as np
@@ -32,6 +33,9 @@ except ImportError:
 	pass
 
 from shared.check_libraries import *
+from shared.resources import resources
+from shared.hmm_disambiguator import hmmdisambiguator
+from cy_postagger import pos_tag
 
 def evaluate(leniency, gold_file, tagged_file):
 	# Check for the python libraries required by evaluate_cytag
@@ -55,41 +59,8 @@ def evaluate(leniency, gold_file, tagged_file):
 		gold_token_ids = [int(token.attrib["id"]) for token in gold_tokens]
 		# Find only those tagged tokens that are also present in the list of gold tokens
 		tagged_tokens = [token for token in all_tagged_tokens if int(token.attrib["id"]) in gold_token_ids]
-		# Create a variable to store the number of unknown tokens
-		unknown = 0
-		# Create variables to store the numbers of basic and rich POS tagging errors
-		basic_errors, rich_errors = 0, 0
-		# For each token in the tagged tree...
-		for token_id, tagged_token in enumerate(tagged_tokens):
-			# Find the corresponding gold standard token
-			gold_token = gold_tokens[token_id]
-			# If the basic POS tag for the tagged token is 'unk', increment the number of unknown tokens by one
-			if tagged_token.attrib["basic_pos"] == "unk":
-				unknown += 1
-			# Otherwise...
-			else:
-				# If the basic POS tags for the tagged and the gold standard token are different...
-				if tagged_token.attrib["basic_pos"] != gold_token.attrib["basic_pos"]:
-					# Increment the number of basic POS tagging errors by one
-					basic_errors += 1
-				# If the rich POS tags for the tagged and the gold standard token are different...
-				if tagged_token.attrib["rich_pos"] != gold_token.attrib["rich_pos"]:
-					# If a soft evaluation is being run...
-					if leniency == "soft":
-						# If the token is a noun but the gender is not the same, do nothing
-						if tagged_token.attrib["basic_pos"] == "E" and gold_token.attrib["basic_pos"] == "E" and tagged_token.attrib["rich_pos"][-1:] == gold_token.attrib["rich_pos"][-1:]:
-							pass
-						# If the gold and tagged tokens' basic POS tags are both verb or pronoun, but one is tagged (rich POS) as singular and the other plural, do nothing
-						elif (tagged_token.attrib["basic_pos"] == gold_token.attrib["basic_pos"] and (tagged_token.attrib["basic_pos"] == "Rha" or tagged_token.attrib["basic_pos"] == "B") and tagged_token.attrib["rich_pos"][-2:] == "ll" and gold_token.attrib["rich_pos"][-1:] == "u") or (tagged_token.attrib["basic_pos"] == gold_token.attrib["basic_pos"] and (tagged_token.attrib["basic_pos"] == "Rha" or tagged_token.attrib["basic_pos"] == "B") and tagged_token.attrib["rich_pos"][-1:] == "u" and gold_token.attrib["rich_pos"][-2:] == "ll"):
-							pass
-						# Otherwise...
-						else:
-							# Increment the number of rich POS tagging errors by one
-							rich_errors += 1
-					# Otherwise...
-					else:
-						# Increment the number of rich POS tagging errors by one
-						rich_errors += 1
+		# Count the basic and rich POS tagging errors, and the unknown tokens
+		basic_errors, rich_errors, unknown = count_errors(leniency, [token.attrib for token in gold_tokens], [token.attrib for token in tagged_tokens])
 		# Print details about the numbers of errors and unknown tokens to the terminal
 		print("From {} tokens:\n--- {} basic POS tag errors\n--- {} rich POS tag errors\n--- {} unknown tokens".format(len(tagged_tokens), basic_errors, rich_errors, unknown))
 		# Calculate the precision, recall, and F1 score of CyTag considering only basic POS tags
@@ -104,6 +75,93 @@ def evaluate(leniency, gold_file, tagged_file):
 		print("\nFinal statistics {}considering only basic POS tags:\n--- precision: {}\n--- recall:    {}\n--- F1:        {}".format(" (soft evaluation) " if leniency == "soft" else "", round(basic_precision, 2), round(basic_recall, 2), round(basic_f, 2)))
 		print("\nFinal statistics {}considering the rich POS tags:\n--- precision: {}\n--- recall:    {}\n--- F1:        {}".format(" (soft evaluation) " if leniency == "soft" else "", round(rich_precision, 2), round(rich_recall,2), round(rich_f, 2)))
 
+def compare_engines(leniency, gold_file, folds=10):
+	# Check for the python libraries required to compare CyTag's disambiguation engines
+	library_info = check_libraries("evaluate_cytag", "evaluate_cytag - Compare CyTag output against a gold standard dataset", ["numpy", "lxml"])
+	# If anything other than 'None' was returned from the library check, print it and then return
+	if library_info != None:
+		print(library_info)
+		return
+	print("\nevaluate_cytag - Compare CyTag's disambiguation engines against a gold standard dataset\n---------------------------------------------------------------------------------------\n")
+	# Parse the gold file, and find the tokens in each of its sentences
+	gold_tree = etree.parse(gold_file, etree.XMLParser(remove_blank_text=True))
+	gold_sentences = [sentence.xpath("token[@id]") for sentence in gold_tree.xpath("file/paragraph/sentence")]
+	# Tag the gold standard sentences with each engine in turn - CG-3 (if it is installed) tags them all at once, while the hidden Markov model is cross-validated, tagging each fold of the sentences (every nth sentence) with a model trained on the rest of them
+	previous_disambiguator = resources.disambiguator
+	for engine, engine_name in [["cg", "CG-3"], ["hmm", "Hidden Markov model ({}-fold cross-validated)".format(folds)]]:
+		if engine == "cg" and resources.vislcg3_location == None:
+			print("{}:\n--- VISL CG-3 could not be found, so this engine was not evaluated\n".format(engine_name))
+			continue
+		resources.disambiguator = engine
+		resources.unload("reading_cache")
+		gold_tokens, tagged_tokens, elapsed = [], [], 0
+		for fold in range(folds if engine == "hmm" else 1):
+			if engine == "hmm":
+				resources.hmm_disambiguator = hmmdisambiguator([[(token.text, token.attrib["rich_pos"].strip()) for token in sentence] for i, sentence in enumerate(gold_sentences) if i % folds != fold], resources.coverage, resources.tagsequences)
+			fold_sentences = [sentence for i, sentence in enumerate(gold_sentences) if engine == "cg" or i % folds == fold]
+			# Time how long it takes to POS tag the fold's sentences (from finding their readings to the final pass)
+			start = time.perf_counter()
+			fold_tokens = pos_tag(sum([len(sentence) for sentence in fold_sentences]), gold_document(fold_sentences), [])
+			elapsed += time.perf_counter() - start
+			# If tagging failed, stop and return
+			if not isinstance(fold_tokens, list):
+				resources.disambiguator = previous_disambiguator
+				resources.unload("hmm_disambiguator")
+				return
+			gold_tokens.extend([token.attrib for sentence in fold_sentences for token in sentence])
+			tagged_tokens.extend([{"basic_pos": token[4], "rich_pos": token[5]} for token in fold_tokens])
+		# Count the errors and unknown tokens, and print the accuracy of the engine and how quickly it tagged the sentences
+		basic_errors, rich_errors, unknown = count_errors(leniency, gold_tokens, tagged_tokens)
+		print("{}:\n--- basic POS tag accuracy{}: {:.2%}\n--- rich POS tag accuracy{}:  {:.2%}\n--- unknown tokens: {}\n--- {:,.0f} tokens per second ({} tokens in {:.2f}s)\n".format(engine_name, " (soft)" if leniency == "soft" else "", (len(tagged_tokens) - unknown - basic_errors) / len(tagged_tokens), " (soft)" if leniency == "soft" else "", (len(tagged_tokens) - unknown - rich_errors) / len(tagged_tokens), unknown, len(tagged_tokens) / elapsed, len(tagged_tokens), elapsed))
+	# Go back to the engine that was in use, and forget the last cross-validated model
+	resources.disambiguator = previous_disambiguator
+	resources.unload("hmm_disambiguator")
+
+def gold_document(gold_sentences):
+	# Arrange the tokens of the given gold standard sentences as a single tokenised file (of one segment), so that they are tagged exactly as they were tokenised in the gold standard dataset
+	sentences = [[len(sentence), [[token.text if token.text != None else "", {"location": [0, 0, i], "position": "{},{}".format(i+1, j+1)}] for j, token in enumerate(sentence)]] for i, sentence in enumerate(gold_sentences)]
+	return([["N/A", 1, [[len(sentences), sentences]]]])
+
+def count_errors(leniency, gold_tokens, tagged_tokens):
+	# Compare the POS tags of each tagged token with those of the corresponding gold standard token (each given as a dictionary of attributes), and return the numbers of basic and rich POS tagging errors and of unknown tokens
+	# Create a variable to store the number of unknown tokens
+	unknown = 0
+	# Create variables to store the numbers of basic and rich POS tagging errors
+	basic_errors, rich_errors = 0, 0
+	# For each tagged token...
+	for token_id, tagged_token in enumerate(tagged_tokens):
+		# Find the corresponding gold standard token
+		gold_token = gold_tokens[token_id]
+		# If the basic POS tag for the tagged token is 'unk', increment the number of unknown tokens by one
+		if tagged_token["basic_pos"] == "unk":
+			unknown += 1
+		# Otherwise...
+		else:
+			# If the basic POS tags for the tagged and the gold standard token are different...
+			if tagged_token["basic_pos"] != gold_token["basic_pos"]:
+				# Increment the number of basic POS tagging errors by one
+				basic_errors += 1
+			# If the rich POS tags for the tagged and the gold standard token are different...
+			if tagged_token["rich_pos"] != gold_token["rich_pos"]:
+				# If a soft evaluation is being run...
+				if leniency == "soft":
+					# If the token is a noun but the gender is not the same, do nothing
+					if tagged_token["basic_pos"] == "E" and gold_token["basic_pos"] == "E" and tagged_token["rich_pos"][-1:] == gold_token["rich_pos"][-1:]:
+						pass
+					# If the gold and tagged tokens' basic POS tags are both verb or pronoun, but one is tagged (rich POS) as singular and the other plural, do nothing
+					elif (tagged_token["basic_pos"] == gold_token["basic_pos"] and (tagged_token["basic_pos"] == "Rha" or tagged_token["basic_pos"] == "B") and tagged_token["rich_pos"][-2:] == "ll" and gold_token["rich_pos"][-1:] == "u") or (tagged_token["basic_pos"] == gold_token["basic_pos"] and (tagged_token["basic_pos"] == "Rha" or tagged_token["basic_pos"] == "B") and tagged_token["rich_pos"][-1:] == "u" and gold_token["rich_pos"][-2:] == "ll"):
+						pass
+					# Otherwise...
+					else:
+						# Increment the number of rich POS tagging errors by one
+						rich_errors += 1
+				# Otherwise...
+				else:
+					# Increment the number of rich POS tagging errors by one
+					rich_errors += 1
+	# Return the numbers of errors and unknown tokens
+	return(basic_errors, rich_errors, unknown)
+
 if __name__ == '__main__':
 	args = sys.argv[1:]
 	# If there are three arguments, one text argument and two files...
@@ -0,0 +1,105 @@
+import re
+import codecs
+
+from shared.cg_worker import grammar_file
+
+class cgreading:
+	# A single CG reading of a token - its lemma, {sentence,token} position, POS tags (the morphological parts of its rich tag), English lemmas and mutation (am, nm, sm, hm or empty), or an 'unk' reading if the token was not found
+	__slots__ = ("lemma", "position", "tags", "english", "mutation", "unknown")
+
+	def __init__(self, lemma, position, tags=None, english=None, mutation="", unknown=False):
+		self.lemma, self.position = lemma, position
+		self.tags = tags if tags != None else []
+		self.english = english if english != None else []
+		self.mutation, self.unknown = mutation, unknown
+
+	def rich_tag(self):
+		# Return the rich POS tag of the reading (its morphological parts, without spaces)
+		return("".join(self.tags))
+
+class cgcohort:
+	# A token as it is passed to (and returned by) CG-3, with each of its readings
+	def __init__(self, token, readings=None):
+		self.token = token
+		self.readings = readings if readings != None else []
+
+def encode_reading(reading, glosses=None):
+	# Format a reading as a line of CG-3 input - if a set of glosses is given, only the English lemmas in it are included
+	if reading.unknown == True:
+		return("\t\"{}\" {{{}}} unk\n".format(reading.lemma, reading.position))
+	english = [lemma for lemma in reading.english if glosses == None or lemma in glosses]
+	line = "\t\"{}\" {{{}}} [cy] {}".format(reading.lemma, reading.position, " ".join(reading.tags))
+	if len(english) > 0:
+		line += " {}".format(" ".join([":{}:".format(lemma) for lemma in english]))
+	if reading.mutation != "":
+		line += " + {}".format(reading.mutation)
+	return("{}\n".format(line))
+
+def encode_cohort(cohort, glosses=None):
+	# Format a cohort (the token, followed by each of its readings) as CG-3 input
+	return("\"<{}>\"\n{}".format(cohort.token, "".join([encode_reading(reading, glosses) for reading in cohort.readings])))
+
+def decode_reading(line):
+	# Split a line of CG-3 output into a reading, finding each field from the markers around it (the lemma ends at '" {', the position at '} [' or '} unk', and the tags at the first English lemma or the mutation)
+	lemma_cutoff = line.find("\" {")
+	if line[-3:] == "unk":
+		return(cgreading(line[2:lemma_cutoff], line[lemma_cutoff+3:line.find("} unk")], None, None, "", True))
+	position_cutoff = line.find("} [")
+	tag_cutoff = line.find(" :")
+	# The mutation follows the last English lemma (or, if CG-3 was given no English lemmas for the reading, the tags)
+	mutation_cutoff = line.find(": + ") + 1 if tag_cutoff != -1 else line.find(" + ")
+	if mutation_cutoff > 0:
+		mutation, end = line[mutation_cutoff+3:], mutation_cutoff
+	else:
+		mutation, end = "", len(line)
+	if tag_cutoff == -1:
+		tag_cutoff = end
+	return(cgreading(line[2:lemma_cutoff], line[lemma_cutoff+3:position_cutoff], line[position_cutoff+7:tag_cutoff].split(" "), line[tag_cutoff+2:end-1].split(": :") if tag_cutoff < end else None, mutation))
+
+class cgdecoder:
+	# Parses CG-3 output incrementally (line by line, or from chunks of bytes or text as they are read from CG-3), passing each cohort to the consumer as soon as it is complete
+	def __init__(self, consume):
+		self.consume = consume
+		self.cohort = None
+		self.buffer = ""
+		self.decoder = codecs.getincrementaldecoder("utf-8")()
+
+	def feed(self, data):
+		# Decode the chunk (keeping any incomplete character or line for the next one), and add each complete line
+		self.buffer += self.decoder.decode(data) if isinstance(data, bytes) else data
+		lines = self.buffer.split("\n")
+		self.buffer = lines.pop()
+		for line in lines:
+			self.add_line(line)
+
+	def add_line(self, line):
+		# Skip empty lines - a line that doesn't start with a tab finishes the previous cohort and starts a new one, and any other line is a reading of the current cohort
+		if line == "":
+			return
+		if line[:1] != "\t":
+			self.finish_cohort()
+			self.cohort = cgcohort(line[2:-2])
+		else:
+			self.cohort.readings.append(decode_reading(line))
+
+	def finish_cohort(self):
+		# Pass the cohort in progress (if there is one) to the consumer
+		if self.cohort != None:
+			cohort, self.cohort = self.cohort, None
+			self.consume(cohort)
+
+	def finish(self):
+		# At the end of the output, add any remaining (unterminated) line and finish the last cohort
+		if self.buffer != "":
+			line, self.buffer = self.buffer, ""
+			self.add_line(line)
+		self.finish_cohort()
+
+class grammarglosses:
+	# The English lemmas worth passing to CG-3 - a lemma is kept if any of the CG tags it is split into (at spaces) is a word used somewhere in the grammar, as English lemmas that no rule could refer to can't change how CG-3 disambiguates
+	def __init__(self, grammar=grammar_file):
+		with open(grammar, encoding="utf-8") as grammar_text:
+			self.words = set(re.findall(r"[^\s()\";]+", grammar_text.read()))
+
+	def __contains__(self, lemma):
+		return(any([tag in self.words for tag in ":{}:".format(lemma).split(" ")]))
@@ -0,0 +1,252 @@
+import sys
+import os
+import queue
+import atexit
+import shutil
+import asyncio
+import hashlib
+import tempfile
+import threading
+import subprocess
+
+# The default CyTag CG-3 grammar
+grammar_file = "{}/../../grammars/{}".format(os.path.dirname(os.path.abspath(__file__)), "cy_grammar_2017-08-01")
+
+# A cohort sent to CG-3 (in its own window) after each batch of readings, so that the end of the batch's output can be recognised
+sentinel_cohort = "\"<$cytag-eob$>\""
+sentinel_reading = "\t\"$cytag-eob$\" eob"
+# The text sent to CG-3 at the end of each batch (flushing the batch's last window, then the sentinel cohort in a window of its own)
+end_of_batch = "\n<STREAMCMD:FLUSH>\n{}\n{}\n\n<STREAMCMD:FLUSH>\n".format(sentinel_cohort, sentinel_reading)
+
+def compile_grammar(vislcg3_location, grammar=grammar_file):
+	# Name the binary grammar using the (SHA-256) hash of the grammar file, so that any change to the grammar is compiled again
+	with open(grammar, "rb") as grammar_bytes:
+		digest = hashlib.sha256(grammar_bytes.read()).hexdigest()
+	binary_grammar = "{}.{}.cg3b".format(grammar, digest[:16])
+	# If the grammar hasn't already been compiled, compile it to a uniquely named temporary file (so that processes compiling it at once don't write over each other's) and then move it into place
+	if not os.path.exists(binary_grammar):
+		temporary_grammar = None
+		try:
+			handle, temporary_grammar = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(binary_grammar)), prefix="{}.".format(os.path.basename(binary_grammar)), suffix=".tmp")
+			os.close(handle)
+			subprocess.run([vislcg3_location, "-g", grammar, "--grammar-only", "--grammar-bin", temporary_grammar], stdout=subprocess.DEVNULL, check=True)
+			os.chmod(temporary_grammar, 0o644)
+			os.replace(temporary_grammar, binary_grammar)
+		# If the grammar can't be compiled or saved (e.g. the grammars folder is read-only), remove any temporary file and use the (text) grammar as it is
+		except (OSError, subprocess.CalledProcessError):
+			if temporary_grammar != None and os.path.exists(temporary_grammar):
+				os.remove(temporary_grammar)
+			return(grammar)
+	# Return the location of the binary grammar
+	return(binary_grammar)
+
+class cgworker:
+	# A long-running CG-3 process, which is given batches of CG-formatted readings separated by flush commands
+	def __init__(self, vislcg3_location, grammar=grammar_file):
+		self.vislcg3_location = vislcg3_location
+		self.grammar = compile_grammar(vislcg3_location, grammar)
+		self.process = None
+
+	def start(self):
+		# Start (or restart) the CG-3 process
+		self.process = subprocess.Popen([self.vislcg3_location, "-g", self.grammar], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+	def write(self, batches):
+		# Write each batch of readings as it is produced
+		try:
+			for batch in batches:
+				self.process.stdin.write(batch.encode("utf-8"))
+		# If CG-3 has exited, the missing output will be picked up when reading
+		except (BrokenPipeError, ValueError):
+			pass
+
+	def end_batch(self):
+		# Flush CG-3, and send the sentinel cohort in a window of its own
+		try:
+			self.process.stdin.write(end_of_batch.encode("utf-8"))
+			self.process.stdin.flush()
+		except (BrokenPipeError, ValueError):
+			pass
+
+	def read(self, consume, errors):
+		# Pass each line of CG-3's output to the consumer, until the sentinel cohort is reached
+		started = False
+		while True:
+			line = self.process.stdout.readline().decode("utf-8")
+			# If CG-3 exited before reaching the sentinel, stop (the process is restarted for the next batch)
+			if line == "":
+				break
+			line = line.rstrip("\n")
+			# Once the sentinel cohort is reached, read its reading and stop
+			if line == sentinel_cohort:
+				self.process.stdout.readline()
+				break
+			# Skip the flush commands (and any blank lines left over from the previous batch before its first cohort)
+			if line.startswith("<STREAMCMD:") or (line == "" and started == False):
+				continue
+			started = True
+			# If the consumer fails, keep reading to the end of the batch (so that the worker can be reused), and record the error
+			if len(errors) == 0:
+				try:
+					consume(line)
+				except Exception as error:
+					errors.append(error)
+
+	def stream(self, batches, consume):
+		# Start CG-3 if it isn't running (or has exited)
+		if self.process == None or self.process.poll() != None:
+			self.start()
+		# Read CG-3's output in a separate thread while the batches are written, so that producing readings overlaps with running CG-3 (and CG-3 is never left waiting on a full output pipe)
+		errors = []
+		reader = threading.Thread(target=self.read, args=(consume, errors))
+		reader.start()
+		try:
+			self.write(batches)
+		finally:
+			self.end_batch()
+			reader.join()
+		# Raise any error from the consumer
+		if len(errors) > 0:
+			raise errors[0]
+
+	def run(self, cg_readings):
+		# Run a single batch of readings through CG-3, and return its output
+		cg_output = []
+		self.stream([cg_readings], cg_output.append)
+		return("\n".join(cg_output) + "\n" if len(cg_output) > 0 else "")
+
+	def close(self):
+		# Close CG-3's input, and wait for it to exit
+		if self.process != None and self.process.poll() == None:
+			self.process.stdin.close()
+			self.process.wait()
+
+class cgpool:
+	# A pool of CG-3 workers, each of which runs one batch at a time
+	def __init__(self, vislcg3_location, grammar=grammar_file, size=1):
+		self.vislcg3_location, self.grammar = vislcg3_location, grammar
+		self.workers = []
+		self.idle = queue.Queue()
+		self.lock = threading.Lock()
+		self.ensure(size)
+		atexit.register(self.close)
+
+	def ensure(self, size):
+		# Add workers to the pool until it has at least the given number of them
+		with self.lock:
+			while len(self.workers) < size:
+				worker = cgworker(self.vislcg3_location, self.grammar)
+				self.workers.append(worker)
+				self.idle.put(worker)
+
+	def run(self, cg_readings):
+		# Wait for an idle worker, run the batch through it, and then return the worker to the pool
+		worker = self.idle.get()
+		try:
+			return(worker.run(cg_readings))
+		finally:
+			self.idle.put(worker)
+
+	def stream(self, batches, consume):
+		# Wait for an idle worker, stream the batches through it, and then return the worker to the pool
+		worker = self.idle.get()
+		try:
+			worker.stream(batches, consume)
+		finally:
+			self.idle.put(worker)
+
+	def close(self):
+		# Stop every worker's CG-3 process
+		for worker in self.workers:
+			worker.close()
+
+class asynccgworker:
+	# A long-running CG-3 process driven from an asyncio event loop, which is given batches of CG-formatted readings without blocking the loop
+	def __init__(self, vislcg3_location, grammar=grammar_file):
+		self.vislcg3_location = vislcg3_location
+		self.grammar = compile_grammar(vislcg3_location, grammar)
+		self.process = None
+
+	async def start(self):
+		# Start (or restart) the CG-3 process
+		self.process = await asyncio.create_subprocess_exec(self.vislcg3_location, "-g", self.grammar, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+	async def write(self, cg_readings):
+		# Write the batch of readings followed by the end of the batch, waiting (without blocking) for CG-3 to take them in
+		try:
+			self.process.stdin.write((cg_readings + end_of_batch).encode("utf-8"))
+			await self.process.stdin.drain()
+		# If CG-3 has exited, the missing output will be picked up when reading
+		except (BrokenPipeError, ConnectionResetError):
+			pass
+
+	async def read(self, cg_output):
+		# Add each line of CG-3's output to the list, until the sentinel cohort is reached
+		started = False
+		while True:
+			line = (await self.process.stdout.readline()).decode("utf-8")
+			# If CG-3 exited before reaching the sentinel, stop (the process is restarted for the next batch)
+			if line == "":
+				break
+			line = line.rstrip("\n")
+			# Once the sentinel cohort is reached, read its reading and stop
+			if line == sentinel_cohort:
+				await self.process.stdout.readline()
+				break
+			# Skip the flush commands (and any blank lines left over from the previous batch before its first cohort)
+			if line.startswith("<STREAMCMD:") or (line == "" and started == False):
+				continue
+			started = True
+			cg_output.append(line)
+
+	async def run(self, cg_readings):
+		# Start CG-3 if it isn't running (or has exited)
+		if self.process == None or self.process.returncode != None:
+			await self.start()
+		# Write the batch and read CG-3's output at the same time (so that CG-3 is never left waiting on a full output pipe), and return the lines of output
+		cg_output = []
+		await asyncio.gather(self.write(cg_readings), self.read(cg_output))
+		return(cg_output)
+
+	def running(self):
+		# Return whether the CG-3 process has been started and hasn't yet exited
+		return(self.process != None and self.process.returncode == None)
+
+	async def close(self):
+		# Close CG-3's input, and wait for it to exit
+		if self.running():
+			self.process.stdin.close()
+			await self.process.wait()
+
+class asynccgpool:
+	# A pool of asyncio CG-3 workers, each of which runs one batch at a time (the workers' processes are started by the event loop the first time they are used) - the pool can be used from another event loop (e.g. a later 'asyncio.run') once it has been closed
+	def __init__(self, vislcg3_location, grammar=grammar_file, size=1):
+		self.workers = [asynccgworker(vislcg3_location, grammar) for i in range(size)]
+		self.idle, self.loop = None, None
+
+	async def run(self, cg_readings):
+		# Create the queue of idle workers within the event loop, the first time the pool is used from it
+		loop = asyncio.get_running_loop()
+		if self.loop is not loop:
+			# The CG-3 processes started by another event loop can't be used from this one, so they must have been stopped first
+			if True in [worker.running() for worker in self.workers]:
+				raise RuntimeError("The CG-3 pool is still running processes started by another event loop - close it (with 'await pool.close()') before using it from a new one")
+			self.idle, self.loop = asyncio.Queue(), loop
+			for worker in self.workers:
+				self.idle.put_nowait(worker)
+		# Wait for an idle worker, run the batch through it, and then return the worker to the pool
+		worker = await self.idle.get()
+		try:
+			return(await worker.run(cg_readings))
+		finally:
+			self.idle.put_nowait(worker)
+
+	async def close(self):
+		# Stop every worker's CG-3 process
+		for worker in self.workers:
+			await worker.close()
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# Compile the given grammar file (or the default CyTag grammar) to binary form, using the VISL CG-3 found on the PATH
+	print(compile_grammar(shutil.which("vislcg3"), args[0] if len(args) > 0 else grammar_file))
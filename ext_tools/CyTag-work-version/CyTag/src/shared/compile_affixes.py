@@ -0,0 +1,39 @@
+class affixtrie:
+	# A character trie of terms, for finding which of them a token begins with (or, in reverse, ends with) in a single pass over the start (or end) of the token
+	def __init__(self, reverse=False):
+		self.root = {}
+		self.reverse = reverse
+
+	def add(self, term, index):
+		# Walk (or create) a path through the trie for the characters of the term, and mark where it ends with the term's index in the original list
+		node = self.root
+		for character in (reversed(term) if self.reverse else term):
+			node = node.setdefault(character, {})
+		# (An empty key can't clash with the single characters the other keys are made of)
+		node[""] = min(index, node.get("", index))
+
+	def match(self, token):
+		# Follow the characters of the token through the trie, and return the index and length of the earliest listed term that it begins (or ends) with
+		node, best = self.root, None
+		for depth, character in enumerate(reversed(token) if self.reverse else token):
+			node = node.get(character)
+			if node == None:
+				break
+			if "" in node and (best == None or node[""] < best[0]):
+				best = (node[""], depth+1)
+		return(best)
+
+def compile_affixes(contractions_and_prefixes):
+	# Create tries for the contractions that are elided at the start of a word (ending with an apostrophe) and at the end of a word (starting with one), and a set of the known prefixes
+	affixes = {"leading": affixtrie(), "trailing": affixtrie(reverse=True), "prefixes": set()}
+	# Add each term to the appropriate trie (or set), keeping its place in the original list so that the first listed term still takes precedence
+	for index, term in enumerate(contractions_and_prefixes.keys()):
+		if contractions_and_prefixes[term][0] == "contraction":
+			if term[-1:] == "'":
+				affixes["leading"].add(term, index)
+			if term[:1] == "'":
+				affixes["trailing"].add(term, index)
+		elif contractions_and_prefixes[term][0] == "prefix":
+			affixes["prefixes"].add(term)
+	# Return the compiled tries and set
+	return(affixes)
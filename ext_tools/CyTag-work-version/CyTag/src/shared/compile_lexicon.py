@@ -0,0 +1,169 @@
+import sys
+import os
+import struct
+import hashlib
+import tempfile
+
+from array import array
+
+# The default (tab-separated) CorCenCC lexicon, and the binary snapshot compiled from it
+lexicon_file = "{}/../../lexicon/{}".format(os.path.dirname(os.path.abspath(__file__)), "corcencc_lexicon_2017-09-29")
+snapshot_file = "{}.snapshot".format(lexicon_file)
+
+# Snapshot header - magic bytes, SHA-256 of the source lexicon, source size and modification time, byte order, and the sizes of each section
+snapshot_magic = b"CYLEX002"
+snapshot_header = struct.Struct("<8s32sQQ4sIIIIII")
+
+# The Welsh mutations, as they are undone when looking a token up in the lexicon - the mutated beginning of a token, the (unmutated) beginning it is derived from, the type of mutation (am, nm, sm or hm), and any (lower-cased) tokens that are never treated as that mutation
+mutation_rules = [["ch", "c", "am", []],
+					["ph", "p", "am", []],
+					["th", "t", "am", []],
+					["ngh", "c", "nm", []],
+					["mh", "p", "nm", []],
+					["nh", "t", "nm", []],
+					["ng", "g", "nm", []],
+					["m", "b", "nm", []],
+					["n", "d", "nm", []],
+					["g", "c", "sm", []],
+					["b", "p", "sm", []],
+					["d", "t", "sm", []],
+					["f", "b", "sm", []],
+					["f", "m", "sm", []],
+					["l", "ll", "sm", []],
+					["r", "rh", "sm", []],
+					["dd", "d", "sm", []],
+					["ha", "a", "hm", []],
+					["he", "e", "hm", []],
+					["hi", "i", "hm", []],
+					["ho", "o", "hm", []],
+					["hu", "u", "hm", []],
+					["hw", "w", "hm", []],
+					["hy", "y", "hm", ["hyn"]],
+					["", "g", "sm", []]]
+
+def hash_lexicon(source):
+	# Hash the source lexicon file in blocks, and return the digest
+	digest = hashlib.sha256()
+	with open(source, "rb") as source_bytes:
+		for block in iter(lambda: source_bytes.read(1 << 20), b""):
+			digest.update(block)
+	return(digest.digest())
+
+def write_atomically(path, write):
+	# Write a file (with the given function, passed the open binary file) to a uniquely named temporary file in the same folder, then move it into place - so that a half-written file is never read, and processes writing the same file at once don't write over each other's temporary files
+	handle, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix="{}.".format(os.path.basename(path)), suffix=".tmp")
+	try:
+		with os.fdopen(handle, "wb") as output:
+			write(output)
+		# Temporary files are only readable by their owner, so make the file readable by everyone (as any other file written by CyTag would be)
+		os.chmod(temporary_path, 0o644)
+		os.replace(temporary_path, path)
+	# If the file couldn't be written, remove the temporary file
+	except BaseException:
+		if os.path.exists(temporary_path):
+			os.remove(temporary_path)
+		raise
+
+def read_lexicon_entries(source):
+	# For each (non-comment) line of the tab-separated lexicon, yield its word, lemma, English lemma, basic POS tag and enriched POS tag
+	with open(source, encoding="utf-8") as loaded_lexicon:
+		for entry in loaded_lexicon.read().splitlines():
+			if entry[:1] != "#":
+				entry_parts = entry.split("\t")
+				yield(entry_parts[0], entry_parts[1], entry_parts[2], entry_parts[3], entry_parts[4])
+
+def index_mutations(words):
+	# Create a dictionary of every form that the given words could take when mutated (lower-cased, as tokens are before being unmutated), holding a list of [mutation code, word] for each word it could be a mutation of
+	# The code of each mutation is the index of its mutation rule, plus the number of rules if it only applies to capitalised tokens (i.e. the word itself is capitalised) - so that sorting by code gives the order in which the unmutated forms of a token used to be looked up
+	mutations = {}
+	for word in words:
+		for code, rule in enumerate(mutation_rules):
+			# If the word begins with the rule's unmutated beginning, it could be found from a token with the mutated beginning in its place
+			if word.startswith(rule[1]):
+				mutated = "{}{}".format(rule[0], word[len(rule[1]):])
+			# If the word is capitalised and (but for its first letter) begins with the rule's unmutated beginning, it could be found from a capitalised token with the mutated beginning in its place
+			elif word[:1] == rule[1][:1].upper() and word[1:len(rule[1])] == rule[1][1:]:
+				mutated, code = "{}{}".format(rule[0], word[len(rule[1]):]), code + len(mutation_rules)
+			else:
+				continue
+			if mutated not in rule[3]:
+				mutations.setdefault(mutated, []).append([code, word])
+	# Sort the words each form could be a mutation of by their mutation codes, and return the dictionary
+	for unmutated in mutations.values():
+		unmutated.sort(key=lambda mutation: mutation[0])
+	return(mutations)
+
+def compile_lexicon(source=lexicon_file, snapshot=snapshot_file):
+	# Group the lexicon entries by word, keeping them in the order they appear in the source file
+	words = {}
+	for entry in read_lexicon_entries(source):
+		words.setdefault(entry[0], []).append(entry[1:])
+	# Find every form the words could take when mutated
+	mutations = index_mutations(words.keys())
+	# Build a sorted table of every distinct string in the lexicon (words, their mutated forms, lemmas and tags), sorted by their UTF-8 bytes so that words (and mutated forms) can be binary searched
+	strings = set(words.keys()) | set(mutations.keys())
+	for entries in words.values():
+		for entry in entries:
+			strings.update(entry)
+	encoded = sorted(string.encode("utf-8") for string in strings)
+	string_ids = {string.decode("utf-8"): string_id for string_id, string in enumerate(encoded)}
+	# Record the offset of each string in the string table
+	string_offsets = array("I", [0])
+	for string in encoded:
+		string_offsets.append(string_offsets[-1] + len(string))
+	# Record the string id of each (sorted) word, the offset of its first entry, and the string ids of each of its entries' four fields
+	word_ids, word_entries, entries = array("I"), array("I", [0]), array("I")
+	word_indexes = {}
+	for word in sorted(words.keys(), key=lambda word: word.encode("utf-8")):
+		word_indexes[word] = len(word_ids)
+		word_ids.append(string_ids[word])
+		for entry in words[word]:
+			entries.extend(string_ids[field] for field in entry)
+		word_entries.append(len(entries) // 4)
+	# Record the string id of each (sorted) mutated form, the offset of its first mutation, and the code and word index of each of its mutations
+	mutation_ids, mutation_offsets, word_mutations = array("I"), array("I", [0]), array("I")
+	for mutated in sorted(mutations.keys(), key=lambda mutated: mutated.encode("utf-8")):
+		mutation_ids.append(string_ids[mutated])
+		for code, word in mutations[mutated]:
+			word_mutations.extend([code, word_indexes[word]])
+		mutation_offsets.append(len(word_mutations) // 2)
+	# Write the header and each section to a temporary file, then move it into place so that a half-written snapshot is never mapped
+	source_stat = os.stat(source)
+	header = snapshot_header.pack(snapshot_magic, hash_lexicon(source), source_stat.st_size, source_stat.st_mtime_ns, sys.byteorder[:1].encode("ascii") * 4, len(encoded), len(word_ids), len(entries) // 4, string_offsets[-1], len(mutation_ids), len(word_mutations) // 2)
+	def write_snapshot(snapshot_output):
+		snapshot_output.write(header)
+		for section in [string_offsets, word_ids, word_entries, entries, mutation_ids, mutation_offsets, word_mutations]:
+			section.tofile(snapshot_output)
+		snapshot_output.write(b"".join(encoded))
+	write_atomically(snapshot, write_snapshot)
+	# Return the number of words and entries written to the snapshot
+	return(len(word_ids), len(entries) // 4)
+
+def snapshot_is_current(source=lexicon_file, snapshot=snapshot_file):
+	# If there is no snapshot, it needs to be compiled
+	if not os.path.exists(snapshot):
+		return(False)
+	with open(snapshot, "rb") as snapshot_input:
+		header = snapshot_input.read(snapshot_header.size)
+	# If the snapshot was written by a different version of this script or on a machine with a different byte order, it needs to be recompiled
+	if len(header) != snapshot_header.size:
+		return(False)
+	magic, digest, size, mtime, byteorder = snapshot_header.unpack(header)[:5]
+	if magic != snapshot_magic or byteorder != sys.byteorder[:1].encode("ascii") * 4:
+		return(False)
+	# If the source lexicon is missing, keep using the snapshot
+	if not os.path.exists(source):
+		return(True)
+	# If the source lexicon has the same size and modification time as when the snapshot was compiled, skip hashing it
+	source_stat = os.stat(source)
+	if source_stat.st_size == size and source_stat.st_mtime_ns == mtime:
+		return(True)
+	# Otherwise, the snapshot is current only if the source lexicon's contents are unchanged
+	return(hash_lexicon(source) == digest)
+
+if __name__ == "__main__":
+	args = sys.argv[1:]
+	# Compile the given lexicon file (or the default CorCenCC lexicon) to a snapshot alongside it
+	source = args[0] if len(args) > 0 else lexicon_file
+	compiled = compile_lexicon(source, "{}.snapshot".format(source))
+	print("Compiled {} words ({} entries) from '{}' to '{}.snapshot'".format(compiled[0], compiled[1], source, source))
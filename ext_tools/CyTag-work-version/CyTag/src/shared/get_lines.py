@@ -1,20 +1,75 @@
 import sys
 import os
+import mmap
+import locale
 
 from urllib import parse
 
+class decodedtext(str):
+	# A string of input text that has already been decoded (such as text sent to the CyTag server), which is split into lines as it is rather than being URL-decoded again
+	pass
+
+def read_segments(file):
+	# Find the encoding that input files are read with (as when opening them as text)
+	encoding = locale.getpreferredencoding(False)
+	# If the file is empty, there are no segments to read (and it can't be memory-mapped)
+	if os.path.getsize(file) == 0:
+		return
+	# Memory-map the file, and yield each of its lines (split as 'splitlines' would) along with the byte offset at which it starts, reading no further into the file than the line being yielded
+	with open(file, "rb") as input_file, mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+		offset = 0
+		while offset < len(mapped_file):
+			end = mapped_file.find(b"\n", offset)
+			end = len(mapped_file) if end == -1 else end+1
+			# Decode the line (which may still be split further by other line boundaries, such as carriage returns) and yield each part of it with its own offset
+			for line in mapped_file[offset:end].decode(encoding).splitlines(True):
+				yield(offset, line.splitlines()[0])
+				offset += len(line.encode(encoding))
+			offset = end
+
+def read_segment(file, offset):
+	# Read the single segment (line) starting at the given byte offset in the file (as yielded by 'read_segments')
+	encoding = locale.getpreferredencoding(False)
+	with open(file, "rb") as input_file:
+		input_file.seek(offset)
+		lines = input_file.readline().decode(encoding).splitlines()
+	# Return the segment (or an empty string, if the offset is at the end of the file)
+	return(lines[0] if len(lines) > 0 else "")
+
 def get_lines(input_data):
 	# Create an empty list to hold the line data
 	line_data = []
 	if isinstance(input_data, list):
 		# If the input is a list of files...
 		for file_id, file in enumerate(input_data):
-			# Split each opened file into lines and append them to the line data
-			with open(file) as file_text:
-				line_data.append([file, file_text.read().splitlines()])
+			# Read each file's lines and append them to the line data
+			line_data.append([file, [line for offset, line in read_segments(file)]])
+	elif isinstance(input_data, decodedtext):
+		# If the input is already-decoded text, split it into lines and use them as the line data
+		line_data = [["N/A", input_data.splitlines()]]
 	elif isinstance(input_data, str):
 		input_text = parse.unquote(input_data)
 		# If the input is a string, split the input string into lines and use them as the line data
 		line_data = [["N/A", input_text.replace("\\n", "\n").splitlines()]]
 	# Return the line data
-	return(line_data)
\ No newline at end of file
+	return(line_data)
+
+def iterate_lines(input_data):
+	# If the input is a list of files...
+	if isinstance(input_data, list):
+		for file_id, file in enumerate(input_data):
+			# Yield each line of each file in turn as it is read, along with the file it came from
+			line_id = 0
+			for offset, line in read_segments(file):
+				yield(file_id, file, line_id, line)
+				line_id += 1
+			# If the file is empty, yield it without a line (so that it still appears in any output)
+			if line_id == 0:
+				yield(file_id, file, None, None)
+	# Otherwise, yield each line of the line data for the input string
+	else:
+		for file_id, file in enumerate(get_lines(input_data)):
+			for line_id, line in enumerate(file[1]):
+				yield(file_id, file[0], line_id, line)
+			if len(file[1]) == 0:
+				yield(file_id, file[0], None, None)
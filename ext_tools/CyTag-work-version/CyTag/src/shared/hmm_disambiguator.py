@@ -0,0 +1,129 @@
+import os
+import xml.etree.ElementTree as ElementTree
+
+from collections import Counter
+
+# numpy, which is only needed by the model and so is imported when the first model is created (see 'import_numpy')
+np = None
+
+from shared.tagset import rich_tags
+
+# The default gold standard corpus, from which the model's tag sequences and lexical probabilities are learned
+gold_file = "{}/../../outputs/gold_corpus/{}".format(os.path.dirname(os.path.abspath(__file__)), "cy_goldcorpus_2017-09-29.xml")
+
+# The states standing for the start and end of a sentence, and for any tag the model has never seen
+boundary, unseen = "<s>", "<unk>"
+
+def read_gold_sentences(gold=gold_file):
+	# Return the sentences of a gold standard (CyTag XML-formatted) dataset, each as a list of its tokens and their rich POS tags
+	root = ElementTree.parse(gold).getroot()
+	return([[(token.text, token.attrib["rich_pos"].strip()) for token in sentence.findall("token")] for sentence in root.iter("sentence")])
+
+def import_numpy():
+	# Import numpy, so that runs which don't use the model (e.g. tokenising, or disambiguating with CG-3) don't pay for importing it
+	global np
+	if np == None:
+		try:
+			import numpy
+		except ImportError:
+			raise ImportError("numpy is required to disambiguate with CyTag's hidden Markov model ('--hmm'). Please install it (e.g. 'pip3 install numpy') or use CG-3 instead")
+		np = numpy
+
+class hmmdisambiguator:
+	# A second-order (trigram) hidden Markov model over rich POS tags, which picks the most likely sequence of tags from each token's readings (with the Viterbi algorithm) in-process, as an alternative to disambiguating the readings with CG-3
+	def __init__(self, sentences, coverage=None, tagsequences=None):
+		import_numpy()
+		# Give each tag an id - the sentence boundary, the unseen tag, each tag in the tagset, and any other tag found in the training data
+		found_tags = set([tag for sentence in sentences for token, tag in sentence])
+		if coverage != None:
+			found_tags.update([tag.partition(":")[2] for tag in coverage.values()])
+		if tagsequences != None:
+			found_tags.update(tagsequences.tags)
+		self.tags = [boundary, unseen] + sorted(found_tags | set(rich_tags))
+		self.tag_ids = {tag: tag_id for tag_id, tag in enumerate(self.tags)}
+		n_tags = len(self.tags)
+		# Count each tag trigram in the gold standard sentences (padded with the boundary at both ends), and each tag seen with each (lowercased) token
+		trigrams, self.lexical = [], {}
+		for sentence in sentences:
+			ids = [0, 0] + [self.tag_ids[tag] for token, tag in sentence] + [0]
+			trigrams.extend(zip(ids, ids[1:], ids[2:]))
+			for token, tag in sentence:
+				self.lexical.setdefault(token.lower(), Counter())[self.tag_ids[tag]] += 1
+		# Count each sequence in the tag-sequence dictionary as a trigram too, and each token's tag in the coverage dictionary as one more sighting of it
+		if tagsequences != None:
+			for place, first, second, tag in tagsequences.entries():
+				sequence = [self.tag_ids[first], self.tag_ids[second]]
+				sequence.insert(place, self.tag_ids[tag])
+				trigrams.append(tuple(sequence))
+		if coverage != None:
+			for token, tag in coverage.items():
+				self.lexical.setdefault(token.lower(), Counter())[self.tag_ids[tag.partition(":")[2]]] += 1
+		trigrams = np.array(trigrams, dtype=np.int64).reshape(-1, 3)
+		# Find the (relative) frequencies of each tag, tag bigram and tag trigram - every tag is counted at least once, so that no sequence of tags is impossible
+		unigram_counts = np.bincount(trigrams[:, 2], minlength=n_tags) + 1
+		bigram_counts = np.zeros((n_tags, n_tags))
+		np.add.at(bigram_counts, (trigrams[:, 1], trigrams[:, 2]), 1)
+		self.unigram_probs = unigram_counts / unigram_counts.sum()
+		self.bigram_probs = bigram_counts / np.maximum(bigram_counts.sum(1, keepdims=True), 1)
+		# Keep the trigrams as a sorted array of integer keys (see 'trigram_keys'), along with the frequency of each given the two tags before it
+		keys, trigram_counts = np.unique(self.trigram_key(trigrams[:, 0], trigrams[:, 1], trigrams[:, 2]), return_counts=True)
+		contexts, context_index = np.unique(keys // n_tags, return_inverse=True)
+		context_counts = np.bincount(context_index, weights=trigram_counts)
+		self.trigram_keys, self.trigram_probs = keys, trigram_counts / context_counts[context_index]
+		# Weight the unigram, bigram and trigram frequencies by deleted interpolation - for each trigram, the weight of whichever frequency best predicts it once that trigram is left out is increased by the trigram's count
+		first, second, third = keys // (n_tags * n_tags), keys // n_tags % n_tags, keys % n_tags
+		left_out = np.stack([(unigram_counts[third] - 1) / max(unigram_counts.sum() - 1, 1),
+						(bigram_counts[second, third] - 1) / np.maximum(bigram_counts[second].sum(1) - 1, 1),
+						(trigram_counts - 1) / np.maximum(context_counts[context_index] - 1, 1)])
+		weights = np.bincount(left_out.argmax(0), weights=trigram_counts, minlength=3)
+		self.weights = weights / weights.sum()
+
+	def trigram_key(self, first, second, third):
+		# Encode a trigram (or arrays of trigrams) of tag ids as a single integer
+		return((first * len(self.tags) + second) * len(self.tags) + third)
+
+	def transitions(self, first, second, third):
+		# Return the (log) probabilities of each tag in 'third' following each pair of tags in 'first' and 'second', as an array of shape (first, second, third)
+		keys = self.trigram_key(first[:, None, None], second[None, :, None], third[None, None, :])
+		found = np.minimum(np.searchsorted(self.trigram_keys, keys), len(self.trigram_keys) - 1)
+		trigram_probs = np.where(self.trigram_keys[found] == keys, self.trigram_probs[found], 0)
+		return(np.log(self.weights[0] * self.unigram_probs[third][None, None, :] + self.weights[1] * self.bigram_probs[np.ix_(second, third)][None, :, :] + self.weights[2] * trigram_probs))
+
+	def emissions(self, token, candidates):
+		# Return the (log) probability of the token given each of its candidate tags, up to a constant - found from how often the token was seen with each tag (smoothed over its candidates), divided by how often each tag was seen; a token never seen before is equally likely given any of its tags
+		seen = self.lexical.get(token.lower())
+		if seen == None:
+			return(np.zeros(len(candidates)))
+		counts = np.array([seen.get(tag_id, 0) for tag_id in candidates]) + 0.5
+		return(np.log(counts / counts.sum()) - np.log(self.unigram_probs[candidates]))
+
+	def best_tags(self, candidates, tokens):
+		# Find the most likely sequence of tags (one from each token's array of candidate tag ids), returning the index of the chosen candidate for each token
+		start = np.array([0])
+		# The score of the best path ending in each pair of (previous, current) candidates, and the previous-but-one candidate on that path
+		scores = self.transitions(start, start, candidates[0])[0] + self.emissions(tokens[0], candidates[0])[None, :]
+		backpointers = []
+		previous = start
+		for i in range(1, len(candidates)):
+			extended = scores[:, :, None] + self.transitions(previous, candidates[i-1], candidates[i])
+			backpointers.append(extended.argmax(0))
+			scores = extended.max(0) + self.emissions(tokens[i], candidates[i])[None, :]
+			previous = candidates[i-1]
+		# End the sentence, and trace the best path back from its last pair of candidates
+		scores = scores + self.transitions(previous, candidates[-1], start)[:, :, 0]
+		before, last = np.unravel_index(scores.argmax(), scores.shape)
+		path = [last]
+		for backpointer in reversed(backpointers):
+			path.append(before)
+			before, last = backpointer[before, last], before
+		return([int(index) for index in reversed(path)])
+
+	def disambiguate(self, cohorts):
+		# Find the candidate tags of each cohort in a sentence (the distinct rich POS tags of its readings), and keep only the readings with the most likely tag for each
+		candidate_tags = [list(dict.fromkeys([reading.rich_tag() for reading in cohort.readings])) for cohort in cohorts]
+		if len(cohorts) == 0 or max([len(tags) for tags in candidate_tags]) <= 1:
+			return(cohorts)
+		candidates = [np.array([self.tag_ids.get(tag, 1) for tag in tags]) for tags in candidate_tags]
+		for cohort, tags, best in zip(cohorts, candidate_tags, self.best_tags(candidates, [cohort.token for cohort in cohorts])):
+			cohort.readings = [reading for reading in cohort.readings if reading.rich_tag() == tags[best]]
+		return(cohorts)
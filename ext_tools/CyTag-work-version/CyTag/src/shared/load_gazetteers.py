@@ -8,17 +8,25 @@ def load_gazetteers():
 	for gaz in os.listdir("{}/../../cy_gazetteers".format(os.path.dirname(os.path.abspath(__file__)))):
 		if gaz.rpartition(".")[-1] not in ["py", "json"]: 
 			with open("{}/../../cy_gazetteers/{}".format(os.path.dirname(os.path.abspath(__file__)), gaz), encoding="utf-8") as loaded_gazetteer:
-				# Set up an 'exclude string' variable, which will contain regex negative lookbehind assertions for each term in the gazetteers
-				exclude_string = ""
 				# Split the loaded gazetteer into a list of terms
 				terms = loaded_gazetteer.read().splitlines()
-				for term in terms:
-					# For each term, replace full stops with full stops enclosed by square brackets, then create a regex negative lookbehind assertion for the term and add it to the exclude string 
-					term = term.replace(".", "[.]")
-					exclude_string = exclude_string + "(?<!" + term + ")"
-				# Split the name of the gazetteer file into two, and add two new entries to the gazetteer dictionary using the extension (i.e. abbreviations, acronyms) - EXTENSION (consisting of the regular terms) and EXTENSION_regex (consisting of the regex-formatted negative lookbehind assertions for each term)
+				# Split the name of the gazetteer file into two, and add a new entry to the gazetteer dictionary using the extension (i.e. abbreviations, acronyms), consisting of the terms
 				gaz_name, gaz_ext = os.path.splitext(gaz)
 				gazetteers[gaz_ext[1:]] = terms
-				gazetteers["{}_regex".format(gaz_ext[1:])] = exclude_string
 	# Return the gazetteers dictionary
-	return(gazetteers)
\ No newline at end of file
+	return(gazetteers)
+# The category bit of each gazetteer, for the combined index of every gazetteer's terms (see 'index_gazetteers')
+givenname_m, givenname_f, surname, place, acronym, abbreviation = 1, 2, 4, 8, 16, 32
+gazetteer_categories = {"givennames_m": givenname_m, "givennames_f": givenname_f, "surnames": surname, "places": place, "acronyms": acronym, "abbreviations": abbreviation}
+# The categories of proper nouns
+proper_noun = givenname_m | givenname_f | surname | place
+
+def index_gazetteers(gazetteers, fold_case=False):
+	# Create a dictionary from every term in the gazetteers to a bitmask of the categories of the gazetteers it is found in (or, if 'fold_case' is True, from every case-folded term to the categories of all of the terms it is a case-folded form of)
+	index = {}
+	for gaz_name, category in gazetteer_categories.items():
+		for term in gazetteers.get(gaz_name, []):
+			term = term.casefold() if fold_case == True else term
+			index[term] = index.get(term, 0) | category
+	# Return the index
+	return(index)
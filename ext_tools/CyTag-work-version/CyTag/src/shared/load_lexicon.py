@@ -1,22 +1,183 @@
 import sys
 import os
+import gc
+import mmap
+import subprocess
+import tracemalloc
 
-def load_lexicon():
+from bisect import bisect_left
+
+from shared.compile_lexicon import *
+
+class lexiconentry:
+	# A single entry of a word in the lexicon - its lemma, English lemma, and basic and rich (enriched) POS tags (which can also be found by name, as they were when entries were dictionaries)
+	__slots__ = ("lemma", "lemma_en", "pos_basic", "pos_enriched")
+
+	def __init__(self, lemma, lemma_en, pos_basic, pos_enriched):
+		self.lemma, self.lemma_en, self.pos_basic, self.pos_enriched = lemma, lemma_en, pos_basic, pos_enriched
+
+	def __getitem__(self, field):
+		return(getattr(self, field))
+
+class mappedlexicon:
+	def __init__(self, snapshot):
+		# Memory-map the snapshot and read the sizes of its sections from the header
+		with open(snapshot, "rb") as snapshot_input:
+			self.mapped = mmap.mmap(snapshot_input.fileno(), 0, access=mmap.ACCESS_READ)
+		n_strings, n_words, n_entries, string_bytes, n_mutated, n_mutations = snapshot_header.unpack_from(self.mapped)[5:]
+		# Create (zero-copy) views over each section of the snapshot
+		view, start = memoryview(self.mapped), snapshot_header.size
+		sections = []
+		for length in [n_strings+1, n_words, n_words+1, n_entries*4, n_mutated, n_mutated+1, n_mutations*2]:
+			sections.append(view[start:start+length*4].cast("I"))
+			start += length*4
+		self.string_offsets, self.word_ids, self.word_entries, self.entries, self.mutation_ids, self.mutation_offsets, self.word_mutations = sections
+		self.strings = view[start:start+string_bytes]
+		self.words = _sortedwords(self, self.word_ids)
+		self.mutated_forms = _sortedwords(self, self.mutation_ids)
+		# Keep the decoded POS tags (of which there are few), so that every entry with the same tag shares a single string
+		self.tags = {}
+
+	def string(self, string_id):
+		# Decode a single string from the string table
+		return(str(self.strings[self.string_offsets[string_id]:self.string_offsets[string_id+1]], "utf-8"))
+
+	def tag(self, string_id):
+		# Decode a POS tag from the string table, or return the copy decoded before
+		if string_id not in self.tags:
+			self.tags[string_id] = self.string(string_id)
+		return(self.tags[string_id])
+
+	def find(self, word, words=None):
+		# Binary search the sorted words (or mutated forms) for the given word, and return its index (or -1 if it isn't there)
+		words = words if words != None else self.words
+		encoded = word.encode("utf-8")
+		index = bisect_left(words, encoded)
+		if index < len(words) and words[index] == encoded:
+			return(index)
+		return(-1)
+
+	def __contains__(self, word):
+		return(self.find(word) != -1)
+
+	def __getitem__(self, word):
+		# Find the word, and decode each of its entries
+		index = self.find(word)
+		if index == -1:
+			raise KeyError(word)
+		return(self.word_entries_at(index))
+
+	def word_entries_at(self, index):
+		# Decode each entry of the word at the given index
+		entries = []
+		for entry in range(self.word_entries[index], self.word_entries[index+1]):
+			lemma, lemma_en, pos_basic, pos_enriched = self.entries[entry*4:entry*4+4]
+			entries.append(lexiconentry(self.string(lemma), self.string(lemma_en), self.tag(pos_basic), self.tag(pos_enriched)))
+		return(entries)
+
+	def unmutated(self, token):
+		# Find the (lower-cased) token among the mutated forms, and return the word, type of mutation and entries of each word in the lexicon that the token could be a mutation of (see 'index_mutations')
+		index = self.find(token.lower(), self.mutated_forms)
+		if index == -1:
+			return([])
+		mutations = self.word_mutations[self.mutation_offsets[index]*2:self.mutation_offsets[index+1]*2]
+		# Words that are only found from capitalised tokens are skipped unless the token is capitalised
+		return([(self.string(self.word_ids[mutations[i+1]]), mutation_rules[mutations[i] % len(mutation_rules)][2], self.word_entries_at(mutations[i+1])) for i in range(0, len(mutations), 2) if mutations[i] < len(mutation_rules) or token[0].isupper()])
+
+	def __len__(self):
+		return(len(self.word_ids))
+
+	def keys(self):
+		return([self.string(word_id) for word_id in self.word_ids])
+
+class _sortedwords:
+	# A sequence of the snapshot's words (or mutated forms) as UTF-8 bytes, in sorted order, for use with 'bisect'
+	def __init__(self, lexicon, string_ids):
+		self.lexicon = lexicon
+		self.string_ids = string_ids
+
+	def __getitem__(self, index):
+		string_id = self.string_ids[index]
+		return(self.lexicon.strings[self.lexicon.string_offsets[string_id]:self.lexicon.string_offsets[string_id+1]].tobytes())
+
+	def __len__(self):
+		return(len(self.string_ids))
+
+class parsedlexicon(dict):
+	# A lexicon parsed into memory (used when the snapshot can't be written), with the same index of mutated forms as the snapshot
+	def index_mutations(self):
+		self.mutations = index_mutations(self.keys())
+
+	def unmutated(self, token):
+		# Return the word, type of mutation and entries of each word in the lexicon that the (lower-cased) token could be a mutation of (see 'index_mutations')
+		return([(word, mutation_rules[code % len(mutation_rules)][2], self[word]) for code, word in self.mutations.get(token.lower(), []) if code < len(mutation_rules) or token[0].isupper()])
+
+def parse_lexicon(source=lexicon_file):
 	# Create a dictionary to hold the lexicon
-	lexicon = {}
-	with open("{}/../../lexicon/{}".format(os.path.dirname(os.path.abspath(__file__)), "corcencc_lexicon_2017-09-29"), encoding="utf-8") as loaded_lexicon:
-		# Open the pre-existing (CorCenCC-formatted) lexicon and create entries by splitting its lines 
-		entries = loaded_lexicon.read().splitlines()
-		# For each entry loaded from the lexicon...
-		for entry in entries:
-			if entry[:1] != "#":
-				# Split the parts of the entry by tab
-				entry_parts = entry.split("\t")
-				# If a word is not already in the lexicon dictionary, format the appropriate information and add it to a new list for that word in the lexicon
-				if entry_parts[0] not in lexicon.keys():
-					lexicon[entry_parts[0]] = [{"lemma": entry_parts[1], "lemma_en": entry_parts[2], "pos_basic": entry_parts[3], "pos_enriched": entry_parts[4]}]
-				# Otherwise (if a word is already in the lexicon dictionary), format the appropriate information and append it to the existing list for that word in the lexicon
-				else:
-					lexicon[entry_parts[0]].append({"lemma": entry_parts[1], "lemma_en": entry_parts[2], "pos_basic": entry_parts[3], "pos_enriched": entry_parts[4]})
-	# Return the lexicon dictionary
-	return(lexicon)					
\ No newline at end of file
+	lexicon = parsedlexicon()
+	# For each entry loaded from the (CorCenCC-formatted) lexicon, add it to the list for that word in the lexicon - interning each string, so that entries share a single copy of each POS tag and of any lemma they have in common
+	for entry in read_lexicon_entries(source):
+		lexicon.setdefault(sys.intern(entry[0]), []).append(lexiconentry(*[sys.intern(field) for field in entry[1:]]))
+	# Store each word's entries as a tuple (without the spare room of a list)
+	for word, entries in lexicon.items():
+		lexicon[word] = tuple(entries)
+	# Index the forms the lexicon's words could take when mutated, and return the lexicon dictionary
+	lexicon.index_mutations()
+	return(lexicon)
+
+def load_lexicon(source=lexicon_file, snapshot=None):
+	# Use the snapshot alongside the source lexicon unless another was given
+	snapshot = snapshot if snapshot != None else "{}.snapshot".format(source)
+	# If the snapshot is missing or was compiled from a different version of the source lexicon, (re)compile it
+	if not snapshot_is_current(source, snapshot):
+		try:
+			compile_lexicon(source, snapshot)
+		# If the snapshot can't be written (e.g. the lexicon folder or filesystem is read-only, or the disk is full), parse the source lexicon into memory instead
+		except OSError:
+			return(parse_lexicon(source))
+	# Return the memory-mapped lexicon
+	return(mappedlexicon(snapshot))
+
+def measure(load):
+	# Return the memory (in bytes) allocated by python to load something, and the loaded result
+	tracemalloc.start()
+	loaded = load()
+	allocated = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	return(allocated, loaded)
+
+def load_representation(name, source):
+	# Load the lexicon in one of the ways compared by 'memory_report' - parsed into a dictionary per entry (as the lexicon used to be loaded), parsed into compact entries, or memory-mapped from the (already compiled) snapshot
+	if name == "dictionaries":
+		lexicon = parsedlexicon()
+		for entry in read_lexicon_entries(source):
+			lexicon.setdefault(entry[0], []).append({"lemma": entry[1], "lemma_en": entry[2], "pos_basic": entry[3], "pos_enriched": entry[4]})
+		lexicon.index_mutations()
+		return(lexicon)
+	elif name == "compact entries":
+		return(parse_lexicon(source))
+	else:
+		return(mappedlexicon("{}.snapshot".format(source)))
+
+def measure_representation(name, source):
+	# Return the memory (in bytes) allocated by python to load the lexicon in the given way, after collecting any garbage left over from starting up
+	gc.collect()
+	return(measure(lambda: load_representation(name, source))[0])
+
+def memory_report(source=lexicon_file):
+	# Compare the memory each worker uses to hold the lexicon in each way - the snapshot is compiled first (if it isn't current) so that compiling it isn't measured, and is reported as unavailable (None) if it can't be written
+	snapshot_available = True
+	if not snapshot_is_current(source, "{}.snapshot".format(source)):
+		try:
+			compile_lexicon(source, "{}.snapshot".format(source))
+		except OSError:
+			snapshot_available = False
+	# Measure each way of loading the lexicon in a fresh python process (as each worker would load it), so that no measurement is affected by what was loaded before it (such as strings already interned by an earlier parse)
+	report = []
+	for name in ["dictionaries", "compact entries", "memory-mapped snapshot"]:
+		if name == "memory-mapped snapshot" and snapshot_available == False:
+			report.append((name, None, 0))
+			continue
+		measurement = subprocess.run([sys.executable, "-c", "import sys; sys.path.insert(0, sys.argv[1]); from shared.load_lexicon import measure_representation; print(measure_representation(sys.argv[2], sys.argv[3]))", os.path.dirname(os.path.dirname(os.path.abspath(__file__))), name, source], stdout=subprocess.PIPE, check=True)
+		report.append((name, int(measurement.stdout.decode("utf-8").split()[-1]), os.path.getsize("{}.snapshot".format(source)) if name == "memory-mapped snapshot" else 0))
+	return(report)
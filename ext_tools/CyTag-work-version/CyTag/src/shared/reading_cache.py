@@ -0,0 +1,42 @@
+import threading
+
+from collections import OrderedDict
+
+class readingcache:
+	# A bounded (least recently used) cache of the CG-formatted readings found for each token, with a count of how often tokens were found in it
+	def __init__(self, size=20000):
+		self.size = size
+		self.cached = OrderedDict()
+		self.hits, self.misses = 0, 0
+		self.lock = threading.Lock()
+
+	def find(self, token, finder):
+		# Return the cached readings for the token if there are any (marking them as the most recently used), or find them with the given function and cache them
+		with self.lock:
+			if token in self.cached:
+				self.hits += 1
+				self.cached.move_to_end(token)
+				return(self.cached[token])
+			self.misses += 1
+		readings = finder(token)
+		# If the cache is full, forget the least recently used token's readings
+		with self.lock:
+			self.cached[token] = readings
+			while len(self.cached) > self.size:
+				self.cached.popitem(last=False)
+		return(readings)
+
+	def hit_rate(self):
+		# Return the share of tokens whose readings were found in the cache
+		return(self.hits / (self.hits + self.misses) if self.hits + self.misses > 0 else 0.0)
+
+	def stats(self):
+		# Return the size of the cache, the number of tokens in it, and the numbers of hits and misses so far
+		with self.lock:
+			return({"size": self.size, "cached": len(self.cached), "hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate()})
+
+	def clear(self):
+		# Forget every cached token (e.g. after the lexicon or gazetteers are reloaded), and reset the counts
+		with self.lock:
+			self.cached.clear()
+			self.hits, self.misses = 0, 0
@@ -0,0 +1,154 @@
+import sys
+import os
+import json
+import shutil
+import threading
+
+from shared.load_gazetteers import *
+from shared.load_lexicon import *
+from shared.cg_worker import *
+from shared.compile_affixes import *
+from shared.reading_cache import *
+from shared.cg_stream import *
+from shared.tagsequences import *
+from shared.hmm_disambiguator import *
+
+class loadonce:
+	# A registry property whose loader runs the first time the property is accessed - after that, the loaded resource is stored on the registry itself and returned directly
+	def __init__(self, loader):
+		self.loader = loader
+		self.name = loader.__name__
+		self.lock = threading.Lock()
+
+	def __get__(self, registry, owner):
+		if registry is None:
+			return(self)
+		# Only let one thread load the resource, and have any others wait for it
+		with self.lock:
+			if self.name not in registry.__dict__:
+				registry.__dict__[self.name] = self.loader(registry)
+		return(registry.__dict__[self.name])
+
+class resourceregistry:
+	# The resources used across the CyTag pipeline, each loaded only when a pipeline component first needs it
+	def __init__(self, cytag_location="{}/../..".format(os.path.dirname(os.path.abspath(__file__)))):
+		self.cytag_location = cytag_location
+		# The number of CG-3 processes to shard disambiguation across (see 'cy_postagger.run_cg_stream')
+		self.cg_shards = 1
+		# The number of distinct tokens whose CG-formatted readings are cached (see 'cy_postagger.generate_cg_readings')
+		self.reading_cache_size = 20000
+		# Whether every English lemma is passed to CG-3 in each reading, or only those the grammar could refer to (see 'cg_stream.grammarglosses')
+		self.cg_all_glosses = True
+		# Whether sentences in which every token has exactly one reading are resolved directly, rather than passed through CG-3 (see 'cy_postagger.skip_unambiguous_sentences')
+		self.cg_skip_unambiguous = True
+		# Which engine disambiguates the readings of each token - 'cg' (VISL CG-3, running the CyTag grammar) or 'hmm' (a trigram hidden Markov model, run in-process - see 'hmm_disambiguator')
+		self.disambiguator = "cg"
+		# Caches of results found from the resources, kept outside of the registry (e.g. 'cy_tokeniser.word_spans'), each with the function that clears it and the names of the resources it depends on (see 'add_cache')
+		self.caches = []
+
+	@loadonce
+	def gazetteers(self):
+		# The CorCenCC gazetteers (see 'load_gazetteers')
+		return(load_gazetteers())
+
+	@loadonce
+	def gazetteer_index(self):
+		# Every term in the gazetteers, with a bitmask of the categories of the gazetteers it is found in (see 'index_gazetteers')
+		return(index_gazetteers(self.gazetteers))
+
+	@loadonce
+	def folded_gazetteer_index(self):
+		# The same index for case-folded terms, for finding a term whatever its case (e.g. in text written all in capitals)
+		return(index_gazetteers(self.gazetteers, fold_case=True))
+
+	@loadonce
+	def abbreviations(self):
+		# The terms in the 'abbreviations' gazetteer, grouped into sets by length, for checking whether a sentence boundary follows one (see 'cy_sentencesplitter.split_segment')
+		abbreviations = {}
+		for term in self.gazetteers["abbreviations"]:
+			abbreviations.setdefault(len(term), set()).add(term)
+		return(abbreviations)
+
+	@loadonce
+	def lexicon(self):
+		# The (memory-mapped) CorCenCC lexicon (see 'load_lexicon')
+		return(load_lexicon())
+
+	@loadonce
+	def contractions_and_prefixes(self):
+		# Known contractions and prefixes, loaded from an external .json file
+		with open("{}/cy_gazetteers/contractions_and_prefixes.json".format(self.cytag_location)) as contractionsprefixes_json:
+			return(json.load(contractionsprefixes_json))
+
+	@loadonce
+	def affixes(self):
+		# The known contractions and prefixes, compiled into tries (and a set) for matching against tokens (see 'compile_affixes')
+		return(compile_affixes(self.contractions_and_prefixes))
+
+	@loadonce
+	def coverage(self):
+		# The CyTag tag-token coverage dictionary, loaded from an external .json file
+		with open("{}/lexicon/{}".format(self.cytag_location, "CyTag_tag-token_coverage")) as coverage_file:
+			return(json.load(coverage_file))
+
+	@loadonce
+	def tagsequences(self):
+		# The CyTag tag-sequence dictionary, as an integer-encoded table compiled from an external .json file (see 'tagsequences')
+		return(load_tagsequences("{}/lexicon/{}".format(self.cytag_location, "CyTag_tag-sequences")))
+
+	@loadonce
+	def reading_cache(self):
+		# A cache of the CG-formatted readings found for the most recently seen tokens, so that frequent tokens aren't looked up and formatted again (see 'reading_cache')
+		return(readingcache(self.reading_cache_size))
+
+	@loadonce
+	def cg_glosses(self):
+		# The English lemmas to pass to CG-3 (or None, if every English lemma is passed)
+		return(None if self.cg_all_glosses == True else grammarglosses())
+
+	@loadonce
+	def hmm_disambiguator(self):
+		# A trigram hidden Markov model of rich POS tags, trained from the gold standard corpus and the coverage and tag-sequence dictionaries (see 'hmm_disambiguator')
+		return(hmmdisambiguator(read_gold_sentences("{}/outputs/gold_corpus/{}".format(self.cytag_location, "cy_goldcorpus_2017-09-29.xml")), self.coverage, self.tagsequences))
+
+	@loadonce
+	def vislcg3_location(self):
+		# The location of VISL CG-3 (or None if it isn't installed)
+		return(shutil.which("vislcg3"))
+
+	@loadonce
+	def cg_workers(self):
+		# A pool of warm CG-3 processes, running the (pre-compiled) CyTag grammar (see 'cg_worker')
+		return(cgpool(self.vislcg3_location, size=self.cg_shards))
+
+	def can_disambiguate(self):
+		# Return whether the chosen disambiguation engine can be run - the hidden Markov model always can, but CG-3 needs VISL CG-3 to be installed
+		return(self.disambiguator == "hmm" or self.vislcg3_location != None)
+
+	def unload(self, *names):
+		# Forget the given resources (if they have been loaded), so that they are loaded again when next used - along with the abbreviations and indexes found from the gazetteers, if the gazetteers are reloaded
+		if "gazetteers" in names:
+			names = names + ("abbreviations", "gazetteer_index", "folded_gazetteer_index")
+		# The hidden Markov model was trained from the coverage and tag-sequence dictionaries, so forget it too if either is reloaded
+		if "coverage" in names or "tagsequences" in names:
+			names = names + ("hmm_disambiguator",)
+		for name in names:
+			self.__dict__.pop(name, None)
+		# The cached readings were found from the gazetteers, lexicon, and contractions and prefixes (and were formatted with the chosen English lemmas), so forget them too if any of those are reloaded
+		if len(set(names) & {"gazetteers", "gazetteer_index", "lexicon", "contractions_and_prefixes", "cg_glosses"}) > 0:
+			self.__dict__.pop("reading_cache", None)
+		# Clear any other caches found from the resources that have been forgotten
+		for clear, dependencies in self.caches:
+			if len(set(names) & dependencies) > 0:
+				clear()
+
+	def add_cache(self, clear, *dependencies):
+		# Register a cache (by the function that clears it) of results found from the given resources, so that it is cleared whenever any of them are forgotten
+		self.caches.append((clear, set(dependencies)))
+
+	def loaded(self):
+		# Return the names of the resources that have been loaded so far
+		return([name for name, attribute in vars(type(self)).items() if isinstance(attribute, loadonce) and name in self.__dict__])
+
+# The registry shared by every component of the pipeline
+resources = resourceregistry()
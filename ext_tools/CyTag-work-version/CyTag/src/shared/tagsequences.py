@@ -0,0 +1,130 @@
+import sys
+import os
+import ast
+import json
+import struct
+
+from array import array
+
+from shared.compile_lexicon import hash_lexicon, write_atomically
+
+# The default CyTag tag-sequence dictionary (a .json file of stringified lists such as "['Be', 'find', 'Atdt']", each mapped to the rich POS tag most often found in place of 'find'), and the integer-encoded table compiled from it
+tagsequence_file = "{}/../../lexicon/{}".format(os.path.dirname(os.path.abspath(__file__)), "CyTag_tag-sequences")
+table_file = "{}.snapshot".format(tagsequence_file)
+
+# Table header - magic bytes, SHA-256 of the source dictionary, source size and modification time, byte order, and the sizes of each section
+table_magic = b"CYSEQ001"
+table_header = struct.Struct("<8s32sQQ4sIII")
+
+class tagsequencetable:
+	# The tag-sequence dictionary as a sorted array of integer keys (one for each sequence - the place of the token being found, and the ids of the tags of the two tokens around it) and an array of the id of the tag found for each
+	def __init__(self, tags, keys, values):
+		self.tags, self.keys, self.values = tags, keys, values
+		self.tag_ids = {tag: tag_id for tag_id, tag in enumerate(tags)}
+		# Index the keys, so that finding a sequence is a single (integer) hash lookup
+		self.sequences = dict(zip(keys, values))
+
+	def find(self, place, first, second):
+		# Return the rich POS tag for a token at the given place in a sequence (0 if it comes before the other two tokens, 1 if it is between them, or 2 if it comes after them) of the given tags, or None if the sequence isn't in the table
+		first, second = self.tag_ids.get(first), self.tag_ids.get(second)
+		if first == None or second == None:
+			return(None)
+		tag_id = self.sequences.get(sequence_key(place, first, second, len(self.tags)))
+		return(self.tags[tag_id] if tag_id != None else None)
+
+	def entries(self):
+		# Yield each sequence in the table - the place of the token being found, the other two tags (in order), and the tag found
+		n_tags = len(self.tags)
+		for key, tag_id in zip(self.keys, self.values):
+			yield(key // (n_tags * n_tags), self.tags[key // n_tags % n_tags], self.tags[key % n_tags], self.tags[tag_id])
+
+	def __len__(self):
+		return(len(self.keys))
+
+def sequence_key(place, first, second, n_tags):
+	# Encode the place of the token being found and the ids of the other two tags as a single integer
+	return((place * n_tags + first) * n_tags + second)
+
+def read_tagsequences(source):
+	# For each sequence in the tag-sequence dictionary, yield the place of the token being found, the other two tags (in order), and the tag found
+	with open(source) as tagsequence_json:
+		for sequence, tag in json.load(tagsequence_json).items():
+			sequence = ast.literal_eval(sequence)
+			place = sequence.index("find")
+			yield(place, sequence[:place] + sequence[place+1:], tag)
+
+def build_table(source):
+	# Give each distinct tag an id (in sorted order), and encode each sequence as an integer key - returning the tags, and the sorted keys and their tags' ids
+	sequences = list(read_tagsequences(source))
+	tags = sorted(set([tag for sequence in sequences for tag in sequence[1] + [sequence[2]]]))
+	tag_ids = {tag: tag_id for tag_id, tag in enumerate(tags)}
+	encoded = sorted([(sequence_key(place, tag_ids[context[0]], tag_ids[context[1]], len(tags)), tag_ids[tag]) for place, context, tag in sequences])
+	return(tags, array("I", [key for key, tag_id in encoded]), array("I", [tag_id for key, tag_id in encoded]))
+
+def compile_tagsequences(source=tagsequence_file, table=table_file):
+	# Encode the tag-sequence dictionary, and build a table of the UTF-8 bytes of each tag and the offsets between them
+	tags, keys, values = build_table(source)
+	encoded = [tag.encode("utf-8") for tag in tags]
+	tag_offsets = array("I", [0])
+	for tag in encoded:
+		tag_offsets.append(tag_offsets[-1] + len(tag))
+	# Write the header and each section to a temporary file, then move it into place so that a half-written table is never loaded
+	source_stat = os.stat(source)
+	header = table_header.pack(table_magic, hash_lexicon(source), source_stat.st_size, source_stat.st_mtime_ns, sys.byteorder[:1].encode("ascii") * 4, len(tags), len(keys), tag_offsets[-1])
+	def write_table(table_output):
+		table_output.write(header)
+		for section in [tag_offsets, keys, values]:
+			section.tofile(table_output)
+		table_output.write(b"".join(encoded))
+	write_atomically(table, write_table)
+	# Return the number of tags and sequences written to the table
+	return(len(tags), len(keys))
+
+def table_is_current(source=tagsequence_file, table=table_file):
+	# If there is no table, it needs to be compiled
+	if not os.path.exists(table):
+		return(False)
+	with open(table, "rb") as table_input:
+		header = table_input.read(table_header.size)
+	# If the table was written by a different version of this script or on a machine with a different byte order, it needs to be recompiled
+	if len(header) != table_header.size:
+		return(False)
+	magic, digest, size, mtime, byteorder = table_header.unpack(header)[:5]
+	if magic != table_magic or byteorder != sys.byteorder[:1].encode("ascii") * 4:
+		return(False)
+	# If the source dictionary is missing, keep using the table
+	if not os.path.exists(source):
+		return(True)
+	# If the source dictionary has the same size and modification time as when the table was compiled, skip hashing it
+	source_stat = os.stat(source)
+	if source_stat.st_size == size and source_stat.st_mtime_ns == mtime:
+		return(True)
+	# Otherwise, the table is current only if the source dictionary's contents are unchanged
+	return(hash_lexicon(source) == digest)
+
+def read_table(table):
+	# Read each section of the table into an array, and decode its tags
+	with open(table, "rb") as table_input:
+		n_tags, n_sequences, tag_bytes = table_header.unpack(table_input.read(table_header.size))[5:]
+		sections = []
+		for length in [n_tags+1, n_sequences, n_sequences]:
+			section = array("I")
+			section.fromfile(table_input, length)
+			sections.append(section)
+		tag_offsets, keys, values = sections
+		encoded = table_input.read(tag_bytes)
+	tags = [str(encoded[tag_offsets[i]:tag_offsets[i+1]], "utf-8") for i in range(n_tags)]
+	return(tagsequencetable(tags, keys, values))
+
+def load_tagsequences(source=tagsequence_file, table=None):
+	# Use the table alongside the source dictionary unless another was given
+	table = table if table != None else "{}.snapshot".format(source)
+	# If the table is missing or was compiled from a different version of the source dictionary, (re)compile it
+	if not table_is_current(source, table):
+		try:
+			compile_tagsequences(source, table)
+		# If the table can't be written (e.g. the lexicon folder or filesystem is read-only), encode the source dictionary in memory instead
+		except OSError:
+			return(tagsequencetable(*build_table(source)))
+	# Return the table
+	return(read_table(table))
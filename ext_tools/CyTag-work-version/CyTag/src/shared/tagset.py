@@ -0,0 +1,204 @@
+# The CyTag tagset - every module that needs to know which rich POS tags there are, which basic POS tag each belongs to, or which morphological elements make it up, should use the tables and lookups here rather than keeping its own copy
+
+# A tag categories table, storing the appropriate rich POS tags that collapse into each basic POS tag
+tag_categories = [["E", ["Egu", "Ebu", "Egll", "Ebll", "Egbu", "Egbll", "Ep", "Epg", "Epb"]],
+					["Ar", ["Arsym", "Ar1u", "Ar2u", "Ar3gu", "Ar3bu", "Ar1ll", "Ar2ll", "Ar3ll"]],
+					["Cys", ["Cyscyd", "Cysis"]],
+					["Rhi", ["Rhifol", "Rhifold", "Rhifolt", "Rhitref", "Rhitrefd", "Rhitreft"]],
+					["Ans", ["Anscadu", "Anscadbu", "Anscadll", "Anscyf", "Anscym", "Anseith"]],
+					["B", ["Be", "Bpres1u", "Bpres2u", "Bpres3u", "Bpres1ll", "Bpres2ll", "Bpres3ll", "Bpresamhers", "Bpres3perth", "Bpres3amhen",
+							"Bdyf1u", "Bdyf2u", "Bdyf3u", "Bdyf1ll", "Bdyf2ll", "Bdyf3ll", "Bdyfamhers",
+							"Bgorb1u", "Bgorb2u", "Bgorb3u", "Bgorb1ll", "Bgorb2ll", "Bgorb3ll", "Bgorbamhers",
+							"Bamherff1u", "Bamherff2u", "Bamherff3u", "Bamherff1ll", "Bamherff2ll", "Bamherff3ll", "Bamherffamhers",
+							"Bgorff1u", "Bgorff2u", "Bgorff3u", "Bgorff1ll", "Bgorff2ll", "Bgorff3ll", "Bgorffamhers", "Bgorffsef",
+							"Bgorch2u", "Bgorch3u", "Bgorch1ll", "Bgorch2ll", "Bgorch3ll", "Bgorchamhers",
+							"Bdibdyf1u", "Bdibdyf2u", "Bdibdyf3u", "Bdibdyf1ll", "Bdibdyf2ll", "Bdibdyf3ll", "Bdibdyfamhers",
+							"Bamod1u", "Bamod2u", "Bamod3u", "Bamod1ll", "Bamod2ll", "Bamod3ll", "Bamodamhers"]],
+					["Rha", ["Rhapers1u", "Rhapers2u", "Rhapers3gu", "Rhapers3bu", "Rhapers1ll", "Rhapers2ll", "Rhapers3ll",
+							"Rhadib1u", "Rhadib2u", "Rhadib3gu", "Rhadib3bu", "Rhadib1ll", "Rhadib2ll", "Rhadib3ll",
+							"Rhamedd1u", "Rhamedd2u", "Rhamedd3gu", "Rhamedd3bu", "Rhamedd1ll", "Rhamedd2ll", "Rhamedd3ll",
+							"Rhacys1u", "Rhacys2u", "Rhacys3gu", "Rhacys3bu", "Rhacys1ll", "Rhacys2ll", "Rhacys3ll",
+							"Rhagof", "Rhadangg", "Rhadangb", "Rhadangd", "Rhaperth", "Rhaatb", "Rhacil"]],
+					["U", ["U", "Uneg", "Ucad", "Ugof", "Utra", "Uberf"]],
+					["Gw", ["Gwest", "Gwfform", "Gwsym", "Gwacr", "Gwtalf", "Gwdig", "Gwllyth", "Gwann"]],
+					["Atd", ["Atdt", "Atdcan", "Atdchw", "Atdde", "Atdcys", "Atddyf"]],
+					["YFB", ["YFB"]],
+					["Adf", ["Adf"]],
+					["Ebych", ["Ebych"]]]
+
+# A table, storing the appropriate morphological elements that make up each rich POS tag
+morphological_table = [["Egu", ["E", "g", "u"]],
+						["Ebu", ["E", "b", "u"]],
+						["Egll", ["E", "g", "ll"]],
+						["Ebll", ["E", "b", "ll"]],
+						["Egbu", ["E", "gb", "u"]],
+						["Egbll", ["E", "gb", "ll"]],
+						["Ep", ["E", "p"]],
+						["Epg", ["E", "p", "g"]],
+						["Epb", ["E", "p", "b"]],
+						["Arsym", ["Ar", "sym"]],
+						["Ar1u", ["Ar", "1", "u"]],
+						["Ar2u", ["Ar", "2", "u"]],
+						["Ar3gu", ["Ar", "3", "g", "u"]],
+						["Ar3bu", ["Ar", "3", "b", "u"]],
+						["Ar1ll", ["Ar", "1", "ll"]],
+						["Ar2ll", ["Ar", "2", "ll"]],
+						["Ar3ll", ["Ar", "3", "ll"]],
+						["Cyscyd", ["Cys", "cyd"]],
+						["Cysis", ["Cys", "is"]],
+						["Rhifol", ["Rhi", "fol"]],
+						["Rhifold", ["Rhi", "fol", "d"]],
+						["Rhifolt", ["Rhi", "fol", "t"]],
+						["Rhitref", ["Rhi", "tref"]],
+						["Rhitrefd", ["Rhi", "tref", "d"]],
+						["Rhitreft", ["Rhi", "tref", "t"]],
+						["Anscadu", ["Ans", "cad", "u"]],
+						["Anscadbu", ["Ans", "cad", "b", "u"]],
+						["Anscadll", ["Ans", "cad", "ll"]],
+						["Anscyf", ["Ans", "cyf"]],
+						["Anscym", ["Ans", "cym"]],
+						["Anseith", ["Ans", "eith"]],
+						["Be", ["B", "e"]],
+						["Bpres1u", ["B", "pres", "1", "u"]],
+						["Bpres2u", ["B", "pres", "2", "u"]],
+						["Bpres3u", ["B", "pres", "3", "u"]],
+						["Bpres1ll", ["B", "pres", "1", "ll"]],
+						["Bpres2ll", ["B", "pres", "2", "ll"]],
+						["Bpres3ll", ["B", "pres", "3", "ll"]],
+						["Bpresamhers", ["B", "pres", "amhers"]],
+						["Bpres3perth", ["B", "pres", "3", "perth"]],
+						["Bpres3amhen", ["B", "pres", "3", "amhen"]],
+						["Bdyf1u", ["B", "dyf", "1", "u"]],
+						["Bdyf2u", ["B", "dyf", "2", "u"]],
+						["Bdyf3u", ["B", "dyf", "3", "u"]],
+						["Bdyf1ll", ["B", "dyf", "1", "ll"]],
+						["Bdyf2ll", ["B", "dyf", "2", "ll"]],
+						["Bdyf3ll", ["B", "dyf", "3", "ll"]],
+						["Bdyfamhers", ["B", "dyf", "amhers"]],
+						["Bgorb1u", ["B", "gorb", "1", "u"]],
+						["Bgorb2u", ["B", "gorb", "2", "u"]],
+						["Bgorb3u", ["B", "gorb", "3", "u"]],
+						["Bgorb1ll", ["B", "gorb", "1", "ll"]],
+						["Bgorb2ll", ["B", "gorb", "2", "ll"]],
+						["Bgorb3ll", ["B", "gorb", "3", "ll"]],
+						["Bgorbamhers", ["B", "gorb", "amhers"]],
+						["Bamherff1u", ["B", "amherff", "1", "u"]],
+						["Bamherff2u", ["B", "amherff", "2", "u"]],
+						["Bamherff3u", ["B", "amherff", "3", "u"]],
+						["Bamherff1ll", ["B", "amherff", "1", "ll"]],
+						["Bamherff2ll", ["B", "amherff", "2", "ll"]],
+						["Bamherff3ll", ["B", "amherff", "3", "ll"]],
+						["Bamherffamhers", ["B", "amherff", "amhers"]],
+						["Bgorff1u", ["B", "gorff", "1", "u"]],
+						["Bgorff2u", ["B", "gorff", "2", "u"]],
+						["Bgorff3u", ["B", "gorff", "3", "u"]],
+						["Bgorff1ll", ["B", "gorff", "1", "ll"]],
+						["Bgorff2ll", ["B", "gorff", "2", "ll"]],
+						["Bgorff3ll", ["B", "gorff", "3", "ll"]],
+						["Bgorffamhers", ["B", "gorff", "amhers"]],
+						["Bgorffsef", ["B", "gorch", "sef"]],
+						["Bgorch2u", ["B", "gorch", "2", "u"]],
+						["Bgorch3u", ["B", "gorch", "3", "u"]],
+						["Bgorch1ll", ["B", "gorch", "1", "ll"]],
+						["Bgorch2ll", ["B", "gorch", "2", "ll"]],
+						["Bgorch3ll", ["B", "gorch", "3", "ll"]],
+						["Bgorchamhers", ["B", "gorch", "amhers"]],
+						["Bdibdyf1u", ["B", "dibdyf", "1", "u"]],
+						["Bdibdyf2u", ["B", "dibdyf", "2", "u"]],
+						["Bdibdyf3u", ["B", "dibdyf", "3", "u"]],
+						["Bdibdyf1ll", ["B", "dibdyf", "1", "ll"]],
+						["Bdibdyf2ll", ["B", "dibdyf", "2", "ll"]],
+						["Bdibdyf3ll", ["B", "dibdyf", "3", "ll"]],
+						["Bdibdyfamhers", ["B", "dibdyf", "amhers"]],
+						["Bamod1u", ["B", "amod", "1", "u"]],
+						["Bamod2u", ["B", "amod", "2", "u"]],
+						["Bamod3u", ["B", "amod", "3", "u"]],
+						["Bamod1ll", ["B", "amod", "1", "ll"]],
+						["Bamod2ll", ["B", "amod", "2", "ll"]],
+						["Bamod3ll", ["B", "amod", "3", "ll"]],
+						["Bamodamhers", ["B", "amod", "amhers"]],
+						["Rhapers1u", ["Rha", "pers", "1", "u"]],
+						["Rhapers2u", ["Rha", "pers", "2", "u"]],
+						["Rhapers3gu", ["Rha", "pers", "3", "g", "u"]],
+						["Rhapers3bu", ["Rha", "pers", "3", "b", "u"]],
+						["Rhapers1ll", ["Rha", "pers", "1", "ll"]],
+						["Rhapers2ll", ["Rha", "pers", "2", "ll"]],
+						["Rhapers3ll", ["Rha", "pers", "3", "ll"]],
+						["Rhadib1u", ["Rha", "dib", "1", "u"]],
+						["Rhadib2u", ["Rha", "dib", "2", "u"]],
+						["Rhadib3gu", ["Rha", "dib", "3", "g", "u"]],
+						["Rhadib3bu", ["Rha", "dib", "3", "b", "u"]],
+						["Rhadib1ll", ["Rha", "dib", "1", "ll"]],
+						["Rhadib2ll", ["Rha", "dib", "2", "ll"]],
+						["Rhadib3ll", ["Rha", "dib", "3", "ll"]],
+						["Rhamedd1u", ["Rha", "medd", "1", "u"]],
+						["Rhamedd2u", ["Rha", "medd", "2", "u"]],
+						["Rhamedd3gu", ["Rha", "medd", "3", "g", "u"]],
+						["Rhamedd3bu", ["Rha", "medd", "3", "b", "u"]],
+						["Rhamedd1ll", ["Rha", "medd", "1", "ll"]],
+						["Rhamedd2ll", ["Rha", "medd", "2", "ll"]],
+						["Rhamedd3ll", ["Rha", "medd", "3", "ll"]],
+						["Rhacys1u", ["Rha", "cys", "1", "u"]],
+						["Rhacys2u", ["Rha", "cys", "2", "u"]],
+						["Rhacys3gu", ["Rha", "cys", "3", "g", "u"]],
+						["Rhacys3bu", ["Rha", "cys", "3", "b", "u"]],
+						["Rhacys1ll", ["Rha", "cys", "1", "ll"]],
+						["Rhacys2ll", ["Rha", "cys", "2", "ll"]],
+						["Rhacys3ll", ["Rha", "cys", "3", "ll"]],
+						["Rhagof", ["Rha", "gof"]],
+						["Rhadangg", ["Rha", "dang", "g"]],
+						["Rhadangb", ["Rha", "dang", "b"]],
+						["Rhadangd", ["Rha", "dang", "d"]],
+						["Rhaperth", ["Rha", "perth"]],
+						["Rhaatb", ["Rha", "atb"]],
+						["Rhacil", ["Rha", "cil"]],
+						["Uneg", ["U", "neg"]],
+						["Ucad", ["U", "cad"]],
+						["Ugof", ["U", "gof"]],
+						["Utra", ["U", "tra"]],
+						["Uberf", ["U", "berf"]],
+						["Gwest", ["Gw", "est"]],
+						["Gwfform", ["Gw", "fform"]],
+						["Gwsym", ["Gw", "sym"]],
+						["Gwacr", ["Gw", "acr"]],
+						["Gwtalf", ["Gw", "talf"]],
+						["Gwdig", ["Gw", "dig"]],
+						["Gwllyth", ["Gw", "llyth"]],
+						["Gwann", ["Gw", "ann"]],
+						["Atdt", ["Atd", "t"]],
+						["Atdcan", ["Atd", "can"]],
+						["Atdchw", ["Atd", "chw"]],
+						["Atdde", ["Atd", "de"]],
+						["Atdcys", ["Atd", "cys"]],
+						["Atdyf", ["Atd", "dyf"]]]
+
+# Lookups built once from the tables above (where a tag is listed more than once, the first entry is used, as when the tables were searched in order):
+#	--- each rich POS tag's basic POS tag, and its list of morphological elements
+#	--- the rich POS tag made up of each (space-separated) string of morphological elements
+#	--- the valid 'basic:rich' tag pairs (each basic tag paired with itself, and then with each of its rich tags)
+#	--- an integer id for each basic tag, rich tag and tag pair (their positions in 'basic_tags', 'rich_tags' and 'tag_pairs')
+rich_to_basic, rich_to_morphology, morphology_to_rich = {}, {}, {}
+for basic, rich_tags in tag_categories:
+	for rich in rich_tags:
+		rich_to_basic.setdefault(rich, basic)
+for rich, morphology in morphological_table:
+	rich_to_morphology.setdefault(rich, morphology)
+	morphology_to_rich.setdefault(" ".join(morphology), rich)
+basic_tags = [basic for basic, rich_tags in tag_categories]
+rich_tags = list(rich_to_basic.keys())
+tag_pairs = ["{}:{}".format(basic, tag) for basic, rich in tag_categories for tag in [basic] + rich]
+basic_ids = {tag: i for i, tag in enumerate(basic_tags)}
+rich_ids = {tag: i for i, tag in enumerate(rich_tags)}
+pair_ids = {pair: i for i, pair in enumerate(tag_pairs)}
+
+def basic_tag(tag):
+	# Return the basic POS tag for a given rich POS tag (or the tag itself, if it isn't a known rich POS tag)
+	return(rich_to_basic.get(tag, tag))
+
+################################################################################################
+# For a given (rich) POS tag, split it into a list of its morphological elements and return it #
+################################################################################################
+
+def tag_morphology(tag):
+	# Return the list of morphological elements of the input POS tag from the morphological table (or a list of the input POS tag itself, if it isn't in the table)
+	return(rich_to_morphology.get(tag, [tag]))
@@ -0,0 +1,35 @@
+import sys
+import os
+import unittest
+sys.path.insert(0, "{}/../src/".format(os.path.dirname(os.path.abspath(__file__))))
+
+from cy_postagger import tokenise_documents
+from shared.resources import resources
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+class rawtexttest(unittest.TestCase):
+	# Text passed to the tagging API is tagged as it is - percent sequences and backslashes are never decoded, as text given on the command line is
+
+	def test_tokenise_documents_keeps_percent_sequences(self):
+		outputs, tokenised_files = tokenise_documents(["Mae 50%25 o bobl", "a\\nb"])
+		tokens = [[token[0] for segment in tokenised_file[2] for sentence in segment[1] for token in sentence[1]] for tokenised_file in tokenised_files]
+		self.assertEqual(tokens[0], ["Mae", "50", "%", "25", "o", "bobl"])
+		self.assertEqual(len(tokenised_files[1][2]), 1)
+
+	@unittest.skipIf(numpy == None, "numpy is needed to tag with the hidden Markov model")
+	def test_tagger_keeps_percent_sequences(self):
+		from cy_tagger import tagger
+		disambiguator, resources.disambiguator = resources.disambiguator, "hmm"
+		try:
+			cytagger = tagger()
+			self.assertEqual([row[1] for row in cytagger.tag("Mae 50%25 o bobl").tsv_rows()], ["Mae", "50", "%", "25", "o", "bobl"])
+			self.assertEqual([[row[1] for row in output.tsv_rows()] for output in cytagger.tag_many(["Mae 50%20 o bobl"])], [["Mae", "50", "%", "20", "o", "bobl"]])
+		finally:
+			resources.disambiguator = disambiguator
+
+if __name__ == "__main__":
+	unittest.main()
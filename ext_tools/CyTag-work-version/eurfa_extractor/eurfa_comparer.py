@@ -2,172 +2,24 @@ import sys
 import os
 import re
 import csv
+sys.path.insert(0, "{}/../CyTag/src/".format(os.path.dirname(os.path.abspath(__file__))))
 
-basic_tags = {
-		"Egu": "E",
-		"YFB": "YFB",
-		"Arsym": "Ar",
-		"Cyscyd": "Cys",
-		"Rhifol": "Rhi",
-		"Anscadu": "Ans",
-		"Adf": "Adf",
-		"Be": "B",
-		"Rhapers1u": "Rha",
-		"Uneg": "U",
-		"Ebych": "Ebych",
-		"Gwest": "Gw",
-		"Atdt": "Atd",
-}
+from shared.tagset import rich_to_basic
 
-tag_dict = {
+basic_tags = {
 		"Egu": "E",
-		"Ebu": "E",
-		"Egll": "E",
-		"Ebll": "E",
-		"Egbu": "E",
-		"Egbll": "E",
-		"Ep": "E",
-		"Epg": "E",
-		"Epb": "E",
 		"YFB": "YFB",
 		"Arsym": "Ar",
-		"Ar1u": "Ar",
-		"Ar2u": "Ar",
-		"Ar3gu": "Ar",
-		"Ar3bu": "Ar",
-		"Ar1ll": "Ar",
-		"Ar2ll": "Ar",
-		"Ar3ll": "Ar",
 		"Cyscyd": "Cys",
-		"Cysis": "Cys",
 		"Rhifol": "Rhi",
-		"Rhifold": "Rhi",
-		"Rhifolt": "Rhi",
-		"Rhitref": "Rhi",
-		"Rhitrefd": "Rhi",
-		"Rhitreft": "Rhi",
 		"Anscadu": "Ans",
-		"Anscadbu": "Ans",
-		"Anscadll": "Ans",
-		"Anscyf": "Ans",
-		"Anscym": "Ans",
-		"Anseith": "Ans",
 		"Adf": "Adf",
 		"Be": "B",
-		"Bpres1u": "B",
-		"Bpres2u": "B",
-		"Bpres3u": "B",
-		"Bpres1ll": "B",
-		"Bpres2ll": "B",
-		"Bpres3ll": "B",
-		"Bpresamhers": "B",
-		"Bpres3perth": "B",
-		"Bpres3amhen": "B",
-		"Bdyf1u": "B",
-		"Bdyf2u": "B",
-		"Bdyf3u": "B",
-		"Bdyf1ll": "B",
-		"Bdyf2ll": "B",
-		"Bdyf3ll": "B",
-		"Bdyfamhers": "B",
-		"Bgorb1u": "B",
-		"Bgorb2u": "B",
-		"Bgorb3u": "B",
-		"Bgorb1ll": "B",
-		"Bgorb2ll": "B",
-		"Bgorb3ll": "B",
-		"Bgorbamhers": "B",
-		"Bamherff1u": "B",
-		"Bamherff2u": "B",
-		"Bamherff3u": "B",
-		"Bamherff1ll": "B",
-		"Bamherff2ll": "B",
-		"Bamherff3ll": "B",
-		"Bamherffamhers": "B",
-		"Bgorff1u": "B",
-		"Bgorff2u": "B",
-		"Bgorff3u": "B",
-		"Bgorff1ll": "B",
-		"Bgorff2ll": "B",
-		"Bgorff3ll": "B",
-		"Bgorffamhers": "B",
-		"Bgorffsef": "B",
-		"Bgorch2u": "B",
-		"Bgorch3u": "B",
-		"Bgorch1ll": "B",
-		"Bgorch2ll": "B",
-		"Bgorch3ll": "B",
-		"Bgorchamhers": "B",
-		"Bdibdyf1u": "B",
-		"Bdibdyf2u": "B",
-		"Bdibdyf3u": "B",
-		"Bdibdyf1ll": "B",
-		"Bdibdyf2ll": "B",
-		"Bdibdyf3ll": "B",
-		"Bdibdyfamhers": "B",
-		"Bamod1u": "B",
-		"Bamod2u": "B",
-		"Bamod3u": "B",
-		"Bamod1ll": "B",
-		"Bamod2ll": "B",
-		"Bamod3ll": "B",
-		"Bamodamhers": "B",
 		"Rhapers1u": "Rha",
-		"Rhapers2u": "Rha",
-		"Rhapers3gu": "Rha",
-		"Rhapers3bu": "Rha",
-		"Rhapers1ll": "Rha",
-		"Rhapers2ll": "Rha",
-		"Rhapers3ll": "Rha",
-		"Rhadib1u": "Rha",
-		"Rhadib2u": "Rha",
-		"Rhadib3gu": "Rha",
-		"Rhadib3bu": "Rha",
-		"Rhadib1ll": "Rha",
-		"Rhadib2ll": "Rha",
-		"Rhadib3ll": "Rha",
-		"Rhamedd1u": "Rha",
-		"Rhamedd2u": "Rha",
-		"Rhamedd3gu": "Rha",
-		"Rhamedd3bu": "Rha",
-		"Rhamedd1ll": "Rha",
-		"Rhamedd2ll": "Rha",
-		"Rhamedd3ll": "Rha",
-		"Rhacys1u": "Rha",
-		"Rhacys2u": "Rha",
-		"Rhacys3gu": "Rha",
-		"Rhacys3bu": "Rha",
-		"Rhacys1ll": "Rha",
-		"Rhacys2ll": "Rha",
-		"Rhacys3ll": "Rha",
-		"Rhagof": "Rha",
-		"Rhadangg": "Rha",
-		"Rhadangb": "Rha",
-		"Rhadangd": "Rha",
-		"Rhaperth": "Rha",
-		"Rhaatb": "Rha",
-		"Rhacil": "Rha",
 		"Uneg": "U",
-		"Ucad": "U",
-		"Ugof": "U",
-		"Utra": "U",
-		"Uberf": "U",
 		"Ebych": "Ebych",
 		"Gwest": "Gw",
-		"Gwfform": "Gw",
-		"Gwsym": "Gw",
-		"Gwacr": "Gw",
-		"Gwtalf": "Gw",
-		"Gwdig": "Gw",
-		"Gwllyth": "Gw",
-		"Gwrhuf": "Gw",
-		"Gwann": "Gw",
 		"Atdt": "Atd",
-		"Atdcan": "Atd",
-		"Atdchw": "Atd",
-		"Atdde": "Atd",
-		"Atdcys": "Atd",
-		"Atddyf": "Atd"
 }
 
 def compare_lexicon(dictionaries, lexicon_name):
@@ -199,7 +51,7 @@ def compare_lexicon(dictionaries, lexicon_name):
 			wrong_rich = 0
 			for _j, entry in enumerate(dictionary):
 				parts = entry.split("\t")
-				if parts[4] not in tag_dict.keys():
+				if parts[4] not in rich_to_basic:
 					wrong_rich += 1
 					print("{}: {}".format(parts[0], parts[4]))
 				else:
@@ -308,7 +160,7 @@ def compare(lexicon_name, eurfa_file):
 			for _i, entry in enumerate(lexicon):
 				if entry[0] != "#":
 					parts = entry.split("\t")
-					if parts[4] not in tag_dict.keys():
+					if parts[4] not in rich_to_basic:
 					   wrong_rich += 1
 					   print("{}: {}".format(parts[0], parts[4]))
 					else:
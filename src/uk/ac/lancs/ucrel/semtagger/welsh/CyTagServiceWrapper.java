@@ -22,7 +22,14 @@ import java.net.URLEncoder;
 
 public class CyTagServiceWrapper {
     
-    private final String cyTagUrl = "http://cytag.corcencc.org/rest/pos/";
+    private final String DEFAULT_CYTAG_URL = "http://cytag.corcencc.org/rest/pos/";
+    private final String cyTagUrl;
+
+    public CyTagServiceWrapper() {
+        //Use a local CyTag server (see cy_server.py) if one is configured.
+        String configuredUrl = (String) UcrelCorcenccProperties.getInstance().getValue("welsh.cytag.service.url");
+        this.cyTagUrl = configuredUrl != null ? configuredUrl : DEFAULT_CYTAG_URL;
+    }
     
     public String welshTagger(String text) {
         try {